@@ -7,6 +7,27 @@
 # Log file for tmux logging
 LOG_FILE="logs/claude_session.log"
 
+# Capture source: file (log file, default), fifo or socket (in-memory, no disk hop),
+# or pty (parser runs Claude itself; tmux only shows a mirror for humans)
+# e.g. AURA_CAPTURE=fifo ./aura.sh   or   AURA_CAPTURE=socket:/tmp/aura.sock ./aura.sh
+AURA_CAPTURE="${AURA_CAPTURE:-file}"
+CAPTURE_KIND="${AURA_CAPTURE%%:*}"
+CAPTURE_PATH="${AURA_CAPTURE#*:}"
+if [ "$CAPTURE_PATH" = "$AURA_CAPTURE" ]; then
+    case "$CAPTURE_KIND" in
+        fifo) CAPTURE_PATH="logs/claude_session.fifo" ;;
+        socket) CAPTURE_PATH="logs/claude_session.sock" ;;
+        pty) CAPTURE_PATH="claude" ;;
+        *) CAPTURE_PATH="$LOG_FILE" ;;
+    esac
+fi
+export AURA_CAPTURE
+
+# PTY mode: socket the tmux mirror attaches to
+if [ "$CAPTURE_KIND" = "pty" ]; then
+    export AURA_PTY_MIRROR="${AURA_PTY_MIRROR:-logs/claude_pty.sock}"
+fi
+
 # Python parser script
 PARSER="parser.py"
 
@@ -171,8 +192,20 @@ else
     echo "⚠ backend-cli not found, skipping voice response relay"
 fi
 
+# Create the named pipe before the parser or pipe-pane open it
+# (otherwise `cat > path` would silently create a regular file)
+if [ "$CAPTURE_KIND" = "fifo" ] && [ ! -p "$CAPTURE_PATH" ]; then
+    rm -f "$CAPTURE_PATH"
+    mkfifo "$CAPTURE_PATH"
+fi
+
+if [ "$CAPTURE_KIND" = "socket" ] && ! command -v socat &> /dev/null; then
+    echo "Error: socat is required for AURA_CAPTURE=socket. Install it with: brew install socat"
+    exit 1
+fi
+
 # Start the parser
-echo "Starting parser with WebSocket URL: $WS_URL"
+echo "Starting parser with WebSocket URL: $WS_URL (capture: $CAPTURE_KIND)"
 python3 "$PARSER" "$WS_URL" > /tmp/aura-parser.log 2>&1 &
 PARSER_PID=$!
 sleep 1
@@ -187,12 +220,26 @@ echo "✓ Parser started (PID: $PARSER_PID)"
 # Kill existing tmux session if it exists
 tmux kill-session -t "$TMUX_SESSION" 2>/dev/null
 
-# Start Claude in a tmux session
-echo "Starting Claude Code in tmux..."
-tmux new-session -d -s "$TMUX_SESSION" claude
-
-# Enable tmux logging using pipe-pane
-tmux pipe-pane -t "$TMUX_SESSION" -o "cat >> $LOG_FILE"
+if [ "$CAPTURE_KIND" = "pty" ]; then
+    # The parser already spawned Claude under its own PTY; tmux just hosts a mirror
+    echo "Starting Claude Code mirror in tmux..."
+    for i in {1..10}; do
+        [ -S "$AURA_PTY_MIRROR" ] && break
+        sleep 0.5
+    done
+    tmux new-session -d -s "$TMUX_SESSION" "python3 -m aura_parser.pty_host attach $AURA_PTY_MIRROR"
+else
+    # Start Claude in a tmux session
+    echo "Starting Claude Code in tmux..."
+    tmux new-session -d -s "$TMUX_SESSION" claude
+
+    # Enable tmux output capture using pipe-pane
+    case "$CAPTURE_KIND" in
+        fifo) tmux pipe-pane -t "$TMUX_SESSION" -o "cat > $CAPTURE_PATH" ;;
+        socket) tmux pipe-pane -t "$TMUX_SESSION" -o "socat -u - UNIX-CONNECT:$CAPTURE_PATH" ;;
+        *) tmux pipe-pane -t "$TMUX_SESSION" -o "cat >> $CAPTURE_PATH" ;;
+    esac
+fi
 
 echo ""
 echo "========================================"
@@ -218,7 +265,7 @@ echo "  • Backend (STT): /tmp/aura-backend.log"
 echo "  • Backend-CLI (TTS): /tmp/aura-backend-cli.log"
 echo "  • Token server: /tmp/aura-token-server.log"
 echo "  • Parser: /tmp/aura-parser.log"
-echo "  • Claude session: logs/claude_session.log"
+echo "  • Claude session: $CAPTURE_PATH ($CAPTURE_KIND)"
 echo ""
 echo "Press Ctrl+C to stop all services"
 echo "========================================"
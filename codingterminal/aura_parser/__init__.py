@@ -0,0 +1,15 @@
+"""Claude Code terminal parser.
+
+Importing this package is side-effect free: no files are touched, nothing is
+printed and the websocket client isn't loaded until the daemon starts. Run
+the daemon with `python parser.py [ws_url]` or `python -m aura_parser`.
+"""
+
+from .actions import inject_action_to_claude, inject_cancel_to_claude, inject_query_to_claude, parse_number
+from .lines import clean_line, finalize_capture, is_separator, process_line
+
+
+def main(argv=None):
+    """CLI entry point (loads the websocket daemon on demand)"""
+    from .cli import main as cli_main
+    return cli_main(argv)
@@ -0,0 +1,116 @@
+from .config import TMUX_SESSION
+
+
+class TmuxInput:
+    """Send keystrokes to Claude through `tmux send-keys`"""
+
+    def __init__(self, session=TMUX_SESSION):
+        self.session = session
+
+    def send_text(self, text):
+        self._send(text)
+
+    def send_key(self, key):
+        self._send(key)
+
+    def _send(self, keys):
+        import subprocess
+        subprocess.run(
+            ["tmux", "send-keys", "-t", self.session, keys],
+            check=True,
+            capture_output=True
+        )
+
+def inject_query_to_claude(query, claude_input=None):
+    """Inject a query into the Claude session by simulating typing"""
+    import subprocess
+    import time
+    claude_input = claude_input or TmuxInput()
+    try:
+        # Send the query text
+        claude_input.send_text(query)
+        # Small delay
+        time.sleep(0.1)
+        # Send Escape then Enter to submit
+        claude_input.send_key("Escape")
+        time.sleep(0.05)
+        claude_input.send_key("Enter")
+        print(f"⌨️  Injected query: {query[:60]}{'...' if len(query) > 60 else ''}")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Failed to inject query: {e}")
+        return False
+    except FileNotFoundError:
+        print(f"❌ tmux not found. Please install tmux.")
+        return False
+    except OSError as e:
+        print(f"❌ Failed to inject query: {e}")
+        return False
+
+def inject_action_to_claude(action_number, claude_input=None):
+    """Inject an action selection (number) into the Claude session by navigating with arrow keys"""
+    import subprocess
+    import time
+    claude_input = claude_input or TmuxInput()
+    try:
+        # Navigate down (action_number - 1) times
+        # Option 1 = 0 downs, Option 2 = 1 down, Option 3 = 2 downs, etc.
+        down_presses = action_number - 1
+
+        for i in range(down_presses):
+            claude_input.send_key("Down")
+            time.sleep(0.05)  # Small delay between presses
+
+        # Send Enter to confirm selection
+        time.sleep(0.05)
+        claude_input.send_key("Enter")
+        print(f"✓ Selected action {action_number} (pressed Down {down_presses} times)")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Failed to inject action: {e}")
+        return False
+    except FileNotFoundError:
+        print(f"❌ tmux not found. Please install tmux.")
+        return False
+    except OSError as e:
+        print(f"❌ Failed to inject action: {e}")
+        return False
+
+def inject_cancel_to_claude(claude_input=None):
+    """Interrupt whatever Claude is doing (Ctrl-C)"""
+    import subprocess
+    claude_input = claude_input or TmuxInput()
+    try:
+        claude_input.send_key("C-c")
+        print(f"⛔ Sent Ctrl-C to Claude")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Failed to send Ctrl-C: {e}")
+        return False
+    except FileNotFoundError:
+        print(f"❌ tmux not found. Please install tmux.")
+        return False
+    except OSError as e:
+        print(f"❌ Failed to send Ctrl-C: {e}")
+        return False
+
+def parse_number(content):
+    """Parse a number from content (handles digits and spelled-out numbers)"""
+    # Mapping of spelled-out numbers
+    word_to_num = {
+        'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4,
+        'five': 5, 'six': 6, 'seven': 7, 'eight': 8, 'nine': 9,
+        'ten': 10
+    }
+
+    content = str(content).strip().lower()
+
+    # Try to parse as digit
+    if content.isdigit():
+        return int(content)
+
+    # Try to parse as spelled-out number
+    if content in word_to_num:
+        return word_to_num[content]
+
+    return None
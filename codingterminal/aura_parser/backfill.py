@@ -0,0 +1,203 @@
+import argparse
+import contextlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .capture import split_lines
+from .dedupe import ResponseDeduper
+from .history import DEFAULT_DB, HistoryStore
+from .lines import finalize_capture, process_line, starts_response
+from .response import json_default
+
+# Re-parse old claude_session.log files into the history store, in parallel.
+#
+#   python3 parser.py backfill logs/claude_session*.log --workers 8 --check
+#
+# A log is cut into byte ranges that each start on a ⏺ line. process_line
+# resets all of its state on a ⏺ line, so every range parses exactly as it
+# would have in one sequential pass; the only thing carried across a cut is
+# the response still open at the end of a range, which the next range's
+# first ⏺ would have finalized. Chunks run in a process pool and are merged
+# back in file order; dedupe runs during the (sequential) merge.
+#
+# Logs carry no timestamps, so the live parser's time-based dedupe can't be
+# replayed. A redraw lands right after the response it repeats, so only
+# copies within the last few responses are collapsed; the same answer given
+# again later in the session is kept, as the live parser would keep it.
+DEFAULT_CHUNK_MB = 4
+DEDUPE_WINDOW = 4
+
+_bullet = "⏺".encode("utf-8")
+
+
+def split_points(path, chunk_bytes):
+    """Byte offsets that start a chunk: 0, then the first ⏺ line after every chunk_bytes"""
+    size = os.path.getsize(path)
+    points = [0]
+    with open(path, "rb") as f:
+        target = chunk_bytes
+        while target < size:
+            f.seek(target)
+            f.readline()  # finish the line we landed in
+            offset = f.tell()
+            boundary = None
+            while offset < size:
+                raw = f.readline()
+                if is_chunk_start(raw):
+                    boundary = offset
+                    break
+                offset += len(raw)
+            if boundary is None:
+                break
+            if boundary > points[-1]:
+                points.append(boundary)
+            target = boundary + chunk_bytes
+    return points + [size]
+
+
+def is_chunk_start(raw):
+    """A raw log line that process_line would treat as the start of a new response"""
+    if _bullet not in raw:
+        return False
+    text = raw.decode("utf-8", errors="ignore")
+    # Text-mode reads also split on a bare CR, so only the first piece counts.
+    # Same skip rules as process_line: "⏺ ... thought for 3s" is noise, not a start.
+    return starts_response(split_lines(text)[0])
+
+
+def read_lines(path, start, end):
+    """Lines of a byte range, split the way the live parser's text-mode reads split them"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return split_lines(data.decode("utf-8", errors="ignore"))
+
+
+def parse_range(task):
+    """Worker: parse one byte range. Returns (finalized captures, capture still open at the end)."""
+    path, start, end = task
+    responses = []
+    current_capture = None
+    collecting_options = False
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for line in read_lines(path, start, end):
+            current_capture, collecting_options = process_line(
+                line, current_capture, collecting_options, responses
+            )
+    return responses, current_capture
+
+
+def make_deduper(window=DEDUPE_WINDOW):
+    """Deduper for log replays: nearly adjacent copies only, no clock involved"""
+    return ResponseDeduper(window, ttl=None)
+
+
+def merge(results, dedupe_window=DEDUPE_WINDOW):
+    """Chunk results in order → one list of captures, with nearby redraws dropped"""
+    deduper = make_deduper(dedupe_window)
+    merged = []
+    for finalized, trailing in results:
+        # The next chunk (or the end of the file) closes the trailing capture
+        if trailing:
+            trailing.finalize()
+        for capture in finalized + ([trailing] if trailing else []):
+            if not deduper.is_duplicate(capture):
+                merged.append(capture)
+    return merged, deduper
+
+
+def backfill_file(path, pool, chunk_bytes, dedupe_window=DEDUPE_WINDOW):
+    points = split_points(path, chunk_bytes)
+    tasks = [(path, points[i], points[i + 1]) for i in range(len(points) - 1)]
+    results = list(pool.map(parse_range, tasks)) if pool else [parse_range(t) for t in tasks]
+    merged, deduper = merge(results, dedupe_window)
+    return merged, deduper, len(tasks)
+
+
+def sequential_reference(path, dedupe_window=DEDUPE_WINDOW):
+    """What the live parser's loop produces reading the whole file in one pass:
+    process_line with the deduper inline, then finalize_capture at the end.
+    Independent of split_points and merge, so --check tests both."""
+    deduper = make_deduper(dedupe_window)
+    responses = []
+    current_capture = None
+    collecting_options = False
+    with open(path, "r", encoding="utf-8", errors="ignore") as f, \
+            open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for line in f:
+            current_capture, collecting_options = process_line(
+                line, current_capture, collecting_options, responses, deduper
+            )
+        if current_capture:
+            finalize_capture(current_capture, responses, deduper)
+    return responses
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(
+        prog="parser.py backfill",
+        description="Re-parse historical session logs into the history store using all cores"
+    )
+    arg_parser.add_argument("logs", nargs="+", help="claude_session.log files, oldest first")
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    arg_parser.add_argument("--chunk-mb", type=float, default=DEFAULT_CHUNK_MB,
+                            help=f"target chunk size (default {DEFAULT_CHUNK_MB} MB)")
+    arg_parser.add_argument("--db", default=os.environ.get("AURA_HISTORY_DB") or DEFAULT_DB,
+                            help="history database to append to")
+    arg_parser.add_argument("--json", help="also write the merged captures to this JSON file")
+    arg_parser.add_argument("--dry-run", action="store_true", help="parse only, don't store")
+    arg_parser.add_argument("--check", action="store_true",
+                            help="also parse sequentially and verify the results are identical")
+    args = arg_parser.parse_args(argv)
+
+    chunk_bytes = max(1, int(args.chunk_mb * 1024 * 1024))
+    store = None
+    all_captures = []
+    mismatches = 0
+    started = time.perf_counter()
+
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        for path in args.logs:
+            file_started = time.perf_counter()
+            merged, deduper, chunks = backfill_file(path, pool, chunk_bytes)
+            elapsed = time.perf_counter() - file_started
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"✓ {path}: {len(merged)} responses from {chunks} chunks, "
+                  f"{size_mb:.1f} MB in {elapsed:.2f}s ({size_mb / max(elapsed, 1e-9):.1f} MB/s, "
+                  f"{deduper.dropped} duplicates dropped)")
+
+            if args.check:
+                check_started = time.perf_counter()
+                reference = sequential_reference(path)
+                check_elapsed = time.perf_counter() - check_started
+                if reference == merged:
+                    print(f"  ✓ Matches sequential parse ({check_elapsed:.2f}s sequential, "
+                          f"{check_elapsed / max(elapsed, 1e-9):.1f}x speedup)")
+                else:
+                    mismatches += 1
+                    print(f"  ❌ Differs from sequential parse ({len(reference)} vs {len(merged)} responses)")
+
+            if not args.dry_run:
+                if store is None:
+                    store = HistoryStore(args.db, session=f"backfill-{time.strftime('%Y%m%d-%H%M%S')}").open()
+                # Logs carry no per-line timestamps; the file's mtime is the best we have
+                store.add_many(merged, ts=os.path.getmtime(path))
+            all_captures.extend(merged)
+    finally:
+        if pool:
+            pool.shutdown()
+        if store:
+            store.close()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(all_captures, f, ensure_ascii=False, indent=2, default=json_default)
+
+    total = time.perf_counter() - started
+    target = "(dry run)" if args.dry_run else f"into {args.db}"
+    print(f"Backfilled {len(all_captures)} responses from {len(args.logs)} logs {target} "
+          f"in {total:.2f}s with {args.workers} workers")
+    return 1 if mismatches else 0
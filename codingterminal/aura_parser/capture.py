@@ -0,0 +1,280 @@
+import asyncio
+import os
+import stat
+
+# Where Claude's terminal output comes from.
+#
+# aura.sh pipes the tmux pane into one of these:
+#   file   - `cat >> logs/claude_session.log`, tailed by polling (original behaviour)
+#   fifo   - `cat > logs/claude_session.fifo`, read straight from memory
+#   socket - `socat - UNIX-CONNECT:logs/claude_session.sock`, read straight from memory
+#   pty    - no tmux at all: the parser spawns Claude itself (see pty_host.py)
+#
+# Select with AURA_CAPTURE=file|fifo|socket|pty, optionally followed by a path
+# (e.g. AURA_CAPTURE=fifo:/tmp/claude.fifo) or, for pty, the command to run.
+# AURA_CAPTURE_TEE=<path> keeps an audit copy on disk for the in-memory sources
+# without slowing the parser down.
+DEFAULT_FILE = "logs/claude_session.log"
+DEFAULT_FIFO = "logs/claude_session.fifo"
+DEFAULT_SOCKET = "logs/claude_session.sock"
+
+# How many lines the tee may fall behind before it starts dropping them
+TEE_QUEUE_SIZE = 10000
+
+
+def normalize_newlines(text):
+    """CRLF and bare CR become LF. Claude's TUI redraws with a bare CR, and a
+    text-mode read of the log file (FileSource) already splits on it."""
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def split_lines(text):
+    """Split text into lines exactly as FileSource yields them (each ending in LF)"""
+    lines = normalize_newlines(text).split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return [line + "\n" for line in lines]
+
+
+class CaptureEnded(Exception):
+    """The source will never produce another line (Claude exited under the PTY host)"""
+
+
+class CaptureSource:
+    """Base class for a stream of raw terminal lines fed to process_line"""
+
+    name = "base"
+
+    # Sources that own Claude's terminal also provide the input side
+    # (send_text/send_key); the others leave injection to tmux
+    input = None
+
+    def __init__(self, tee_path=None):
+        self.tee = AsyncTee(tee_path) if tee_path else None
+
+    async def start(self):
+        """Prepare the source (create pipes, bind sockets). Safe to call more than once."""
+        if self.tee:
+            self.tee.start()
+
+    async def lines(self):
+        """Yield decoded lines as they arrive"""
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+    async def close(self):
+        if self.tee:
+            await self.tee.close()
+
+    def _emit(self, raw):
+        """Hand a raw chunk to the tee and return its lines, split the way the log file is read"""
+        text = raw.decode("utf-8", errors="ignore") if isinstance(raw, bytes) else raw
+        if self.tee:
+            self.tee.write(text)
+        return split_lines(text)
+
+    def describe(self):
+        return self.name
+
+
+class FileSource(CaptureSource):
+    """Tail the pipe-pane log file (only new content, polled every 100ms)"""
+
+    name = "file"
+
+    def __init__(self, path=DEFAULT_FILE, poll_interval=0.1):
+        # The file already is the audit copy, so there is nothing to tee
+        super().__init__(tee_path=None)
+        self.path = path
+        self.poll_interval = poll_interval
+
+    async def lines(self):
+        with open(self.path, "r", encoding="utf-8", errors="ignore") as f:
+            # Skip to end of file (only watch for new content)
+            f.seek(0, 2)
+            while True:
+                line = f.readline()
+                if not line:
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+                yield line
+
+    def describe(self):
+        return f"file {self.path}"
+
+
+class FifoSource(CaptureSource):
+    """Read pipe-pane output from a named pipe, no disk round trip"""
+
+    name = "fifo"
+
+    def __init__(self, path=DEFAULT_FIFO, tee_path=None):
+        super().__init__(tee_path)
+        self.path = path
+        self._reader = None
+        self._transport = None
+
+    async def start(self):
+        await super().start()
+        if self._reader:
+            return
+        if not os.path.exists(self.path):
+            os.mkfifo(self.path)
+        elif not stat.S_ISFIFO(os.stat(self.path).st_mode):
+            raise RuntimeError(f"{self.path} exists and is not a FIFO")
+
+        # O_RDWR keeps a writer reference open on our side, so the pipe never
+        # reports EOF when pipe-pane's `cat` restarts or hasn't started yet
+        fd = os.open(self.path, os.O_RDWR | os.O_NONBLOCK)
+        loop = asyncio.get_running_loop()
+        self._reader = asyncio.StreamReader(limit=2 ** 20)
+        protocol = asyncio.StreamReaderProtocol(self._reader)
+        self._transport, _ = await loop.connect_read_pipe(
+            lambda: protocol, os.fdopen(fd, "rb", buffering=0)
+        )
+
+    async def lines(self):
+        await self.start()
+        while True:
+            raw = await self._reader.readline()
+            if not raw:
+                return
+            for line in self._emit(raw):
+                yield line
+
+    async def close(self):
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+            self._reader = None
+        await super().close()
+
+    def describe(self):
+        return f"fifo {self.path}"
+
+
+class UnixSocketSource(CaptureSource):
+    """Accept pipe-pane output over a Unix socket, no disk round trip"""
+
+    name = "socket"
+
+    def __init__(self, path=DEFAULT_SOCKET, tee_path=None):
+        super().__init__(tee_path)
+        self.path = path
+        self._server = None
+        self._queue = asyncio.Queue()
+
+    async def start(self):
+        await super().start()
+        if self._server:
+            return
+        # Remove a stale socket left behind by a previous run
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(
+            self._handle_writer, path=self.path, limit=2 ** 20
+        )
+
+    async def _handle_writer(self, reader, writer):
+        print(f"✓ Capture writer connected to {self.path}")
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                for line in self._emit(raw):
+                    self._queue.put_nowait(line)
+        finally:
+            writer.close()
+            print(f"⚠ Capture writer disconnected from {self.path}")
+
+    async def lines(self):
+        await self.start()
+        while True:
+            yield await self._queue.get()
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+        await super().close()
+
+    def describe(self):
+        return f"socket {self.path}"
+
+
+class AsyncTee:
+    """Copy captured lines to disk from a background task so the parser never waits on I/O"""
+
+    def __init__(self, path, batch_size=256):
+        self.path = path
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue = asyncio.Queue(maxsize=TEE_QUEUE_SIZE)
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def write(self, line):
+        try:
+            self._queue.put_nowait(line)
+        except asyncio.QueueFull:
+            # Auditing must not back-pressure the live path
+            self.dropped += 1
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                batch = [await self._queue.get()]
+                while len(batch) < self.batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                await loop.run_in_executor(None, self._write_batch, f, batch)
+
+    @staticmethod
+    def _write_batch(f, batch):
+        f.writelines(batch)
+        f.flush()
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.dropped:
+            print(f"⚠ Capture tee dropped {self.dropped} lines")
+
+
+def make_capture_source(spec=None, tee_path=None):
+    """Build a capture source from an AURA_CAPTURE-style spec ("file", "fifo:/path", ...)"""
+    if spec is None:
+        spec = os.environ.get("AURA_CAPTURE", "file")
+    if tee_path is None:
+        tee_path = os.environ.get("AURA_CAPTURE_TEE") or None
+
+    kind, _, path = spec.partition(":")
+    kind = kind.strip().lower()
+    path = path.strip()
+
+    if kind == "file":
+        return FileSource(path or DEFAULT_FILE)
+    if kind == "fifo":
+        return FifoSource(path or DEFAULT_FIFO, tee_path=tee_path)
+    if kind == "socket":
+        return UnixSocketSource(path or DEFAULT_SOCKET, tee_path=tee_path)
+    if kind == "pty":
+        from .pty_host import PtyHost
+        return PtyHost(
+            command=path or None,
+            mirror_path=os.environ.get("AURA_PTY_MIRROR") or None,
+            tee_path=tee_path,
+        )
+    raise ValueError(f"Unknown capture source '{spec}' (expected file, fifo, socket or pty)")
@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import sys
+
+from .config import JSON_FILE, resolve_ws_url
+from .daemon import BridgeState, run
+from .history import make_history_store
+from .summary import make_summarizer
+
+
+def main(argv=None):
+    """Run the parser daemon: python parser.py [ws_url] [--fresh]
+    or re-parse old logs:       python parser.py backfill LOG... [--workers N] [--check]"""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "backfill":
+        from .backfill import main as backfill_main
+        sys.exit(backfill_main(argv[1:]))
+
+    arg_parser = argparse.ArgumentParser(
+        prog="parser.py",
+        description="Bridge Claude Code's terminal output to a WebSocket server and inject queries back"
+    )
+    arg_parser.add_argument("ws_url", nargs="?", help="WebSocket URL (default: $BRIDGE_WS_URL or ws://localhost:8765)")
+    arg_parser.add_argument("--fresh", action="store_true", help=f"clear {JSON_FILE} instead of resuming from it")
+    args = arg_parser.parse_args(argv)
+
+    ws_url = resolve_ws_url(args.ws_url)
+    state = BridgeState(history=make_history_store(), summarizer=make_summarizer())
+    state.load(fresh=args.fresh)
+
+    if args.fresh:
+        print("Live parser running. Starting fresh.")
+    else:
+        print(f"Live parser running. Resuming with {len(state.responses)} saved responses.")
+    print(f"WebSocket URL: {ws_url}")
+    if state.history:
+        print(f"History: {state.history.path} (session {state.history.session})")
+    if state.summarizer:
+        print(f"Spoken summaries: up to {state.summarizer.max_sentences} sentences / "
+              f"{state.summarizer.max_chars} chars, {state.summarizer.budget * 1000:g} ms CPU budget")
+    print("Watching for new responses only...\n")
+
+    try:
+        sys.exit(asyncio.run(run(ws_url, state)))
+    except KeyboardInterrupt:
+        print("\n\nParser stopped.")
@@ -0,0 +1,17 @@
+import os
+
+# Paths (relative to codingterminal/, where aura.sh runs everything)
+SCRIPT_FILE = "logs/claude_session.log"
+JSON_FILE = "logs/responses.json"
+TMUX_SESSION = "claude_aura"
+
+DEFAULT_WS_URL = "ws://localhost:8765"
+
+
+def resolve_ws_url(url=None):
+    """WebSocket URL, in order of preference:
+    1. Command line argument: python parser.py ws://your-ngrok-url
+    2. Environment variable: BRIDGE_WS_URL=ws://your-ngrok-url python parser.py
+    3. Default: ws://localhost:8765
+    """
+    return url or os.environ.get("BRIDGE_WS_URL", DEFAULT_WS_URL)
@@ -0,0 +1,396 @@
+import asyncio
+import json
+import os
+import time
+
+import websockets
+
+from .actions import TmuxInput, inject_action_to_claude, inject_cancel_to_claude, inject_query_to_claude, parse_number
+from .capture import CaptureEnded, FileSource, make_capture_source
+from .config import JSON_FILE, SCRIPT_FILE, TMUX_SESSION
+from .dedupe import DEFAULT_TTL, DEFAULT_WINDOW, ResponseDeduper, normalize_text
+from .history import history_request_args, new_session_id
+from .lines import finalize_capture, process_line
+from .option_resolver import MIN_CONFIDENCE, resolve_option
+from .profiling import Profiler
+from .response import Capture, json_default, json_default_stored
+from .scheduler import ACTION, CANCEL, QUERY, InputScheduler, lane_key
+
+
+# Newest responses kept in memory and responses.json; the history store has the rest
+DEFAULT_MAX_RESPONSES = 500
+
+# How often responses.json is rewritten while a response is still streaming in
+# (seconds). Completed responses are always written straight away.
+DEFAULT_FLUSH_INTERVAL = 0.5
+
+
+class BridgeState:
+    """Everything the daemon keeps across websocket reconnects"""
+
+    def __init__(self, json_file=JSON_FILE, dedupe_window=None, history=None, summarizer=None):
+        self.json_file = json_file
+        # Indexed store behind "history" messages (None disables it)
+        self.history = history
+        # Adds a short `spoken` summary to each response (None disables it)
+        self.summarizer = summarizer
+        # Tags outgoing responses so relays can keep per-session replay buffers
+        self.session = history.session if history else new_session_id()
+        self.responses = []
+        # Responses kept in memory and responses.json (AURA_MAX_RESPONSES, 0 = all);
+        # older ones stay in the history store
+        self.max_responses = int(os.environ.get("AURA_MAX_RESPONSES", DEFAULT_MAX_RESPONSES))
+        # Throttled responses.json flushes while a response is streaming in
+        self.writer = ResponsesJsonWriter(
+            json_file, float(os.environ.get("AURA_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL))
+        )
+        # Shared dictionary to track the last response with options
+        self.last_response_with_options = {}
+        # Drops re-rendered copies of responses we captured in the last AURA_DEDUPE_TTL
+        # seconds (AURA_DEDUPE_WINDOW=0 disables)
+        if dedupe_window is None:
+            dedupe_window = int(os.environ.get("AURA_DEDUPE_WINDOW", DEFAULT_WINDOW))
+        self.deduper = ResponseDeduper(
+            dedupe_window, float(os.environ.get("AURA_DEDUPE_TTL", DEFAULT_TTL))
+        )
+        # On-demand CPU/memory captures (SIGUSR1/SIGUSR2 or "profile" messages)
+        self.profiler = Profiler()
+        # Queued cancel/action/query injections (kept across reconnects)
+        self.scheduler = InputScheduler(runner=self.profiler.call)
+
+    def load(self, fresh=False):
+        """Resume from responses.json, or clear it when fresh=True. History is never cleared."""
+        if self.history:
+            self.history.open()
+        if fresh or not os.path.exists(self.json_file):
+            self.responses = []
+            write_responses_json(self.responses, None, self.json_file)
+            return
+        try:
+            with open(self.json_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠ Could not read {self.json_file} ({e}); starting with no history")
+            saved = []
+        if not isinstance(saved, list):
+            saved = []
+        self.responses = [Capture.from_dict(r) for r in saved if isinstance(r, dict)]
+        self.trim()
+
+    def trim(self):
+        """Drop the oldest in-memory responses beyond max_responses"""
+        excess = len(self.responses) - self.max_responses
+        if self.max_responses > 0 and excess > 0:
+            del self.responses[:excess]
+
+    def stats(self):
+        stats = {"dedupe": self.deduper.stats(),
+                 "responses": {"in_memory": len(self.responses), "max": self.max_responses,
+                               "json_writes": self.writer.writes},
+                 "scheduler": self.scheduler.stats()}
+        if self.history:
+            stats["history"] = self.history.stats()
+        if self.summarizer:
+            stats["summary"] = self.summarizer.stats()
+        return stats
+
+
+def write_responses_json(responses, current_capture, path=JSON_FILE):
+    """Flush all responses plus the in-progress capture to responses.json"""
+    full_list = responses + [current_capture] if current_capture else responses
+    with open(path, "w", encoding="utf-8") as jf:
+        json.dump(full_list, jf, ensure_ascii=False, indent=2, default=json_default_stored)
+
+
+class ResponsesJsonWriter:
+    """Rewrites responses.json at once when a response completes, and at most every
+    `interval` seconds while one is still open (rewriting it on every line made long
+    answers quadratic)"""
+
+    def __init__(self, path=JSON_FILE, interval=DEFAULT_FLUSH_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.writes = 0
+        self._last = 0.0
+        self._pending = None
+        self._timer = None
+
+    def update(self, responses, current_capture, completed=False):
+        self._pending = (responses, current_capture)
+        elapsed = time.monotonic() - self._last
+        if completed or elapsed >= self.interval:
+            self.flush()
+        elif self._timer is None:
+            # Output may pause mid-answer; don't leave the file stale until the next line
+            self._timer = asyncio.get_running_loop().call_later(self.interval - elapsed, self.flush)
+
+    def flush(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending is None:
+            return
+        responses, current_capture = self._pending
+        self._pending = None
+        # A capture finalized since the update is already in responses (or was a duplicate)
+        if current_capture is not None and current_capture.finalized:
+            current_capture = None
+        write_responses_json(responses, current_capture, self.path)
+        self._last = time.monotonic()
+        self.writes += 1
+
+async def send_to_websocket(websocket, response_data, last_response_with_options, history_id=None, session=None):
+    """Send new response to websocket server"""
+    try:
+        message = {"type": "response", "content": response_data}
+        if session:
+            message["session"] = session
+        if history_id is not None:
+            # Lets clients resume with {"type": "history", "after": <id>}
+            message["history_id"] = history_id
+        payload = json.dumps(message, default=json_default)
+        await websocket.send(payload)
+        print(f"📤 Sent to websocket")
+
+        # Track if this response has options
+        if response_data.get('options'):
+            last_response_with_options['data'] = response_data
+
+    except Exception as e:
+        print(f"❌ Failed to send to websocket: {e}")
+
+async def listen_for_queries(websocket, state, claude_input=None):
+    """Listen for incoming query messages from websocket"""
+    last_response_with_options = state.last_response_with_options
+    scheduler = state.scheduler
+    lane = lane_key(claude_input)
+
+    async def reply(message):
+        await websocket.send(json.dumps(message))
+
+    try:
+        async for message in websocket:
+            print(f"📨 Raw message received: {message[:100]}")
+            try:
+                data = json.loads(message)
+                print(f"📋 Parsed message type: {data.get('type')}")
+
+                # Handle query injection
+                if data.get("type") == "query":
+                    query = data.get("query") or data.get("content")
+                    if query:
+                        print(f"📥 Received query from websocket")
+                        queued = scheduler.submit(
+                            lane, QUERY, lambda query=query: inject_query_to_claude(query, claude_input),
+                            coalesce_key=normalize_text(query)
+                        )
+                        if not queued:
+                            print(f"↺ Same query already waiting; coalesced")
+                    else:
+                        print(f"⚠ Received query message but no query content found")
+
+                # Interrupt Claude (Ctrl-C) ahead of anything queued
+                elif data.get("type") == "cancel":
+                    print(f"📥 Received cancel from websocket")
+                    # Ctrl-C dismisses the menu, so spoken answers can't refer to it any more
+                    last_response_with_options.pop('data', None)
+
+                    async def cancel_done(ok):
+                        if ok:
+                            await reply({"type": "confirmation", "content": "Cancel sent"})
+
+                    scheduler.submit(lane, CANCEL, lambda: inject_cancel_to_claude(claude_input), cancel_done)
+
+                # Report parser counters
+                elif data.get("type") == "stats":
+                    stats_msg = json.dumps({
+                        "type": "stats",
+                        "content": state.stats()
+                    })
+                    await websocket.send(stats_msg)
+                    print(f"📤 Sent stats")
+
+                # Page through stored responses
+                elif data.get("type") == "history":
+                    if state.history:
+                        try:
+                            content = state.history.query(**history_request_args(data))
+                        except (TypeError, ValueError) as e:
+                            content = {"error": f"Invalid history request: {e}"}
+                    else:
+                        content = {"error": "History store is disabled"}
+                    history_msg = {"type": "history", "content": content}
+                    if "request_id" in data:
+                        history_msg["request_id"] = data["request_id"]
+                    await websocket.send(json.dumps(history_msg))
+                    print(f"📤 Sent history page ({len(content.get('items', []))} items)")
+
+                # Start a CPU or memory capture without restarting
+                elif data.get("type") == "profile":
+                    mode = data.get("mode", "cpu")
+                    try:
+                        path = state.profiler.start(mode, data.get("seconds"))
+                        content = {"status": "started", "mode": mode, "file": path}
+                    except (RuntimeError, ValueError) as e:
+                        content = {"status": "error", "mode": mode, "error": str(e)}
+                    await websocket.send(json.dumps({"type": "profile", "content": content}))
+
+                # Handle action selection
+                elif data.get("type") == "action":
+                    content = data.get("content")
+                    if content:
+                        print(f"📥 Received action from websocket: {content}")
+                        action_num = parse_number(content)
+
+                        # Not a bare number: match it against the menu Claude is showing
+                        if action_num is None and last_response_with_options.get('data'):
+                            match = resolve_option(content, last_response_with_options['data']['options'])
+                            if match and match.confidence >= MIN_CONFIDENCE:
+                                action_num = match.number
+                                print(f"🎯 Resolved '{content}' to option {match.number} ({match.reason}, confidence {match.confidence:.2f})")
+                            elif match:
+                                print(f"⚠ Best guess for '{content}' is option {match.number} but confidence is only {match.confidence:.2f}")
+
+                        if action_num is not None:
+                            async def action_done(ok):
+                                if ok:
+                                    # Send confirmation back
+                                    await reply({"type": "confirmation", "content": "Action received"})
+                                    print(f"📤 Sent confirmation: Action received")
+
+                            scheduler.submit(
+                                lane, ACTION, lambda n=action_num: inject_action_to_claude(n, claude_input), action_done
+                            )
+                        else:
+                            print(f"⚠ Could not match '{content}' to an option")
+                            # Resend the last response with options, but with error text
+                            if last_response_with_options.get('data'):
+                                retry_response = {
+                                    'text': f"Please provide a number for your choice (you entered '{content}' which is not valid). Choose from the options below:",
+                                    'options': last_response_with_options['data']['options']
+                                }
+                                retry_msg = json.dumps({
+                                    "type": "response",
+                                    "content": retry_response,
+                                    # Relays file the re-sent menu under this parser's session
+                                    "session": state.session
+                                })
+                                await websocket.send(retry_msg)
+                                print(f"📤 Sent retry request with same options")
+                            else:
+                                # No previous options to resend
+                                error_msg = json.dumps({
+                                    "type": "error",
+                                    "content": "Please provide a valid number"
+                                })
+                                await websocket.send(error_msg)
+                    else:
+                        print(f"⚠ Received action message but no content found")
+
+            except json.JSONDecodeError:
+                print(f"⚠ Received non-JSON message: {message[:50]}")
+            except Exception as e:
+                print(f"❌ Error processing message: {e}")
+
+    except websockets.exceptions.ConnectionClosed:
+        print("⚠ WebSocket connection closed")
+    except Exception as e:
+        print(f"❌ Error in query listener: {e}")
+
+async def parse_log_file(websocket, state, source=None):
+    """Parse captured Claude output and send responses to websocket"""
+    if source is None:
+        source = FileSource(SCRIPT_FILE)
+
+    responses = state.responses
+    current_capture = None
+    collecting_options = False
+
+    async def deliver(completed_response):
+        if state.summarizer:
+            state.summarizer.attach(completed_response)
+        history_id = state.history.add(completed_response) if state.history else None
+        if websocket:
+            try:
+                await send_to_websocket(websocket, completed_response, state.last_response_with_options, history_id, state.session)
+            except:
+                pass
+        state.trim()
+
+    try:
+        async for line in source.lines():
+            stored_before = len(responses)
+            current_capture, collecting_options = process_line(
+                line, current_capture, collecting_options, responses, state.deduper
+            )
+
+            # A response was completed and kept (duplicates never reach responses)
+            completed = len(responses) > stored_before
+            if completed:
+                await deliver(responses[-1])
+
+            # Flush to JSON with current capture
+            if current_capture or completed:
+                state.writer.update(responses, current_capture, completed)
+    except CaptureEnded:
+        # Whatever Claude printed last is complete now
+        if current_capture and finalize_capture(current_capture, responses, state.deduper):
+            await deliver(responses[-1])
+        state.writer.update(responses, None, True)
+        raise
+
+async def run(ws_url, state, source=None):
+    """Connect to the bridge (reconnecting forever) and pump Claude output both ways.
+    Returns 1 if the capture source ends for good (Claude exited under the PTY host)."""
+    try:
+        state.profiler.install_signal_handlers()
+        print(f"✓ Profiling: kill -USR1 {os.getpid()} (CPU) / kill -USR2 {os.getpid()} (memory)")
+    except (NotImplementedError, AttributeError):
+        # No SIGUSR1/SIGUSR2 (e.g. Windows); websocket "profile" messages still work
+        pass
+
+    # Capture source lives across reconnects so the pipe/socket stays open
+    source = source or make_capture_source()
+    await source.start()
+    print(f"✓ Reading Claude output from {source.describe()}")
+
+    # PTY mode writes keystrokes straight to Claude's terminal; otherwise use tmux
+    claude_input = source.input or TmuxInput(TMUX_SESSION)
+
+    while True:
+        websocket = None
+        try:
+            # Try to connect to websocket server with keepalive
+            websocket = await websockets.connect(
+                ws_url,
+                ping_interval=20,  # Send ping every 20 seconds
+                ping_timeout=10    # Wait 10 seconds for pong response
+            )
+            print(f"✓ Connected to websocket server at {ws_url}")
+            print(f"✓ Bidirectional mode: sending responses AND receiving queries")
+
+            # Run both tasks concurrently
+            await asyncio.gather(
+                parse_log_file(websocket, state, source),
+                listen_for_queries(websocket, state, claude_input)
+            )
+        except CaptureEnded as e:
+            print(f"❌ {e}; no more output to read or input to type into. Stopping the parser.")
+            if websocket:
+                try:
+                    await websocket.send(json.dumps({
+                        "type": "error",
+                        "content": f"Claude is no longer running ({e}); the parser stopped",
+                        "session": state.session
+                    }))
+                    await websocket.close()
+                except Exception:
+                    pass
+            await source.close()
+            return 1
+        except websockets.exceptions.ConnectionClosed:
+            print("⚠ WebSocket connection closed. Reconnecting in 3 seconds...")
+            await asyncio.sleep(3)
+        except Exception as e:
+            print(f"⚠ WebSocket error: {e}. Reconnecting in 3 seconds...")
+            await asyncio.sleep(3)
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+from .response import json_default
+
+# Claude's TUI redraws blocks it has already printed, so the same ⏺ response can
+# be captured several times. Each finalized capture is fingerprinted on its
+# normalized content; a fingerprint seen in the recent window is dropped before
+# it reaches responses.json, the websocket and TTS.
+#
+# Redraws arrive within seconds of the original, so a fingerprint only counts
+# for DEFAULT_TTL seconds after it was last seen. The same prompt asked again a
+# minute later (or after a restart) is a new response and goes through.
+DEFAULT_WINDOW = 256
+DEFAULT_TTL = 10.0
+
+
+def normalize_text(text):
+    """Collapse whitespace and case so redraw artifacts don't change the hash"""
+    return " ".join(text.split()).lower()
+
+
+def fingerprint(capture):
+    """Content hash of a capture: normalized text plus its options"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(normalize_text(capture.get("text", "")).encode("utf-8"))
+    for option in capture.get("options") or []:
+        h.update(b"\x1f")
+        h.update(normalize_text(option).encode("utf-8"))
+    return h.digest()
+
+
+class ResponseDeduper:
+    """Bounded recent-hash window (LRU eviction, TTL expiry) with traffic-saved counters.
+    ttl=None keeps fingerprints until they are evicted (logs parsed offline have no times)."""
+
+    def __init__(self, window=DEFAULT_WINDOW, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.window = window
+        self.ttl = ttl
+        self.clock = clock
+        # fingerprint -> when it was last seen, oldest first
+        self._recent = OrderedDict()
+        self.checked = 0
+        self.dropped = 0
+        self.evicted = 0
+        self.expired = 0
+        self.bytes_saved = 0
+
+    def is_duplicate(self, capture):
+        """Record the capture and return True if it was seen recently"""
+        self.checked += 1
+        if self.window <= 0:
+            return False
+
+        now = self.clock()
+        self._expire(now)
+        key = fingerprint(capture)
+        if key in self._recent:
+            # A redraw of a redraw: keep collapsing while they keep coming
+            self._recent[key] = now
+            self._recent.move_to_end(key)
+            self.dropped += 1
+            # What the websocket payload would have cost
+            self.bytes_saved += len(json.dumps(
+                {"type": "response", "content": capture}, ensure_ascii=False, default=json_default
+            ).encode("utf-8"))
+            return True
+
+        self._recent[key] = now
+        if len(self._recent) > self.window:
+            self._recent.popitem(last=False)
+            self.evicted += 1
+        return False
+
+    def _expire(self, now):
+        """Forget fingerprints not seen for ttl seconds (the oldest are at the front)"""
+        if self.ttl is None:
+            return
+        while self._recent:
+            key, seen = next(iter(self._recent.items()))
+            if now - seen <= self.ttl:
+                break
+            del self._recent[key]
+            self.expired += 1
+
+    def stats(self):
+        return {
+            "checked": self.checked,
+            "dropped": self.dropped,
+            "evicted": self.evicted,
+            "expired": self.expired,
+            "bytes_saved": self.bytes_saved,
+            "window": self.window,
+            "ttl": self.ttl,
+            "tracked": len(self._recent),
+        }
@@ -0,0 +1,197 @@
+import json
+import os
+import re
+import sqlite3
+import time
+
+# Indexed history of finalized captures, so clients can page through what
+# Claude said instead of downloading the whole responses.json.
+#
+#   {"type": "history", "limit": 20}                       newest 20
+#   {"type": "history", "before": 120, "limit": 20}        the page before id 120
+#   {"type": "history", "after": 140}                      everything since id 140 (reconnect catch-up)
+#   {"type": "history", "since": 1760000000, "until": ...} time range (unix seconds)
+#   {"type": "history", "q": "migration test"}             full-text search
+#   {"type": "history", "session": "..."}                  one parser run only
+#
+# Filters combine. Set AURA_HISTORY_DB to move the database, or to an empty
+# string to turn the store off.
+DEFAULT_DB = "logs/history.db"
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 200
+
+_search_token_re = re.compile(r"\w+", re.UNICODE)
+
+_INSERT = "INSERT INTO responses (session, seq, ts, text, options) VALUES (?, ?, ?, ?, ?)"
+
+
+def new_session_id():
+    """Identifies one parser run; ordered by start time"""
+    return os.environ.get("AURA_SESSION_ID") or f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+
+class HistoryStore:
+    """SQLite store of finalized captures with FTS5 search (LIKE fallback without FTS5)"""
+
+    def __init__(self, path=DEFAULT_DB, session=None):
+        self.path = path
+        self.session = session or new_session_id()
+        self._conn = None
+        self._seq = 0
+        self.fts = False
+
+    def open(self):
+        if self._conn:
+            return self
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                id INTEGER PRIMARY KEY,
+                session TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                ts REAL NOT NULL,
+                text TEXT NOT NULL,
+                options TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_session_seq ON responses (session, seq);
+            CREATE INDEX IF NOT EXISTS responses_ts ON responses (ts);
+        """)
+        try:
+            self._conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS responses_fts
+                    USING fts5(text, options, content='responses', content_rowid='id');
+                CREATE TRIGGER IF NOT EXISTS responses_fts_insert AFTER INSERT ON responses BEGIN
+                    INSERT INTO responses_fts (rowid, text, options) VALUES (new.id, new.text, new.options);
+                END;
+            """)
+            self.fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search falls back to LIKE
+            self.fts = False
+
+        row = self._conn.execute(
+            "SELECT MAX(seq) FROM responses WHERE session = ?", (self.session,)
+        ).fetchone()
+        self._seq = row[0] or 0
+        self._conn.commit()
+        return self
+
+    def close(self):
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def add(self, capture, ts=None):
+        """Store a finalized capture; returns its history id"""
+        cursor = self._conn.execute(_INSERT, self._row(capture, ts))
+        self._conn.commit()
+        return cursor.lastrowid
+
+    def add_many(self, captures, ts=None):
+        """Store captures in order in a single transaction (backfill)"""
+        self._conn.executemany(_INSERT, (self._row(capture, ts) for capture in captures))
+        self._conn.commit()
+
+    def _row(self, capture, ts):
+        self._seq += 1
+        return (
+            self.session,
+            self._seq,
+            ts or time.time(),
+            capture.get("text", ""),
+            json.dumps(capture.get("options") or [], ensure_ascii=False),
+        )
+
+    def query(self, limit=DEFAULT_LIMIT, before=None, after=None, since=None, until=None,
+              search=None, session=None):
+        """One page of history, newest first (oldest first when paging forward with `after`)"""
+        limit = max(1, min(int(limit or DEFAULT_LIMIT), MAX_LIMIT))
+        where = []
+        params = []
+        table = "responses r"
+
+        if search:
+            tokens = _search_token_re.findall(str(search))
+            if tokens:
+                if self.fts:
+                    table = "responses r JOIN responses_fts f ON f.rowid = r.id"
+                    # Quote every token (no FTS syntax from clients); prefix-match the last one
+                    terms = [f'"{t}"' for t in tokens[:-1]] + [f'"{tokens[-1]}"*']
+                    where.append("responses_fts MATCH ?")
+                    params.append(" ".join(terms))
+                else:
+                    for token in tokens:
+                        where.append("(r.text LIKE ? OR r.options LIKE ?)")
+                        params += [f"%{token}%", f"%{token}%"]
+        if session:
+            where.append("r.session = ?")
+            params.append(session)
+        if since is not None:
+            where.append("r.ts >= ?")
+            params.append(float(since))
+        if until is not None:
+            where.append("r.ts <= ?")
+            params.append(float(until))
+        if before is not None:
+            where.append("r.id < ?")
+            params.append(int(before))
+        if after is not None:
+            where.append("r.id > ?")
+            params.append(int(after))
+
+        order = "ASC" if after is not None else "DESC"
+        sql = f"SELECT r.* FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        # Fetch one extra row to know whether another page exists
+        sql += f" ORDER BY r.id {order} LIMIT ?"
+        rows = self._conn.execute(sql, params + [limit + 1]).fetchall()
+
+        has_more = len(rows) > limit
+        items = [self._row_to_item(row) for row in rows[:limit]]
+        page = {"items": items, "has_more": has_more}
+        if items:
+            # Cursor for the next request in the same direction
+            page["next_after" if after is not None else "next_before"] = items[-1]["id"]
+        return page
+
+    @staticmethod
+    def _row_to_item(row):
+        return {
+            "id": row["id"],
+            "session": row["session"],
+            "seq": row["seq"],
+            "ts": row["ts"],
+            "text": row["text"],
+            "options": json.loads(row["options"]),
+        }
+
+    def stats(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"session": self.session, "stored": count, "session_seq": self._seq, "fts": self.fts}
+
+
+def make_history_store(path=None):
+    """History store from AURA_HISTORY_DB (default logs/history.db), or None if disabled"""
+    if path is None:
+        path = os.environ.get("AURA_HISTORY_DB", DEFAULT_DB)
+    return HistoryStore(path) if path else None
+
+
+def history_request_args(data):
+    """Map a 'history' websocket message onto HistoryStore.query keyword arguments"""
+    return {
+        "limit": data.get("limit"),
+        "before": data.get("before"),
+        "after": data.get("after"),
+        "since": data.get("since"),
+        "until": data.get("until"),
+        "search": data.get("q") or data.get("search"),
+        "session": data.get("session"),
+    }
@@ -0,0 +1,109 @@
+import re
+
+from .response import Capture
+from .segments import add_line, classify_line
+
+# Regex to remove ANSI escape codes
+ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+# Noise prefixes to ignore (but NOT ❯ since that's used for options)
+ignore_prefixes = ("WRITE", "READ", "✽", "g)")
+
+# Lines to completely ignore (terminal UI noise)
+noise_patterns = [
+    "? for shortcuts",
+    "ctrl+c to interrupt",
+    "Esc to",
+    "thought for",
+    "Flibbertigibbeting",
+    "Prestidigitating",
+    "Cascading",
+    "\x07",  # Bell character
+    "0;",    # ANSI escape sequences
+]
+
+def is_separator(line):
+    """Check if line is a separator (made of ─ or ╌ characters)"""
+    return line and (line.replace('─', '') == '' or line.replace('╌', '') == '')
+
+def clean_line(line):
+    return ansi_escape.sub('', line).strip()
+
+def finalize_capture(capture, responses, deduper=None):
+    """Store a completed capture unless it is a recent duplicate. Returns True if stored."""
+    capture.finalize()
+    if deduper is not None and deduper.is_duplicate(capture):
+        print(f"↺ Skipped duplicate response ({deduper.dropped} dropped, {deduper.bytes_saved} bytes saved)")
+        return False
+    responses.append(capture)
+    text = capture.text
+    print(f"✓ Captured response: {text[:60]}{'...' if len(text) > 60 else ''}")
+    return True
+
+def is_ignored(line):
+    """Cleaned lines process_line skips entirely: empty, ignored prefixes and terminal UI noise"""
+    return not line or line.startswith(ignore_prefixes) or any(pattern in line for pattern in noise_patterns)
+
+def starts_response(line):
+    """Whether process_line would start a new capture on this (raw) line"""
+    line = clean_line(line)
+    return line.startswith("⏺") and not is_ignored(line)
+
+def process_line(line, current_capture, collecting_options, responses, deduper=None):
+    """Process a single line and update state"""
+    line = clean_line(line)
+    # Skip empty lines, ignored prefixes and terminal UI noise
+    if is_ignored(line):
+        return current_capture, collecting_options
+
+    # New ⏺ line → save previous capture and start new
+    if line.startswith("⏺"):
+        if current_capture:
+            finalize_capture(current_capture, responses, deduper)
+        first_line = line[1:].strip()
+        current_capture = Capture(first_line)
+        collecting_options = False  # Don't assume options yet
+        print(f"⏺ New response started: {first_line[:60]}")
+    else:
+        # Check for ❯ symbol AND question mark - indicates actual choices (not just a list)
+        if line.startswith("❯") and current_capture and current_capture.has_question:
+            # This is the start of actual choices
+            collecting_options = True
+            # Try to parse the option
+            option_match = re.match(r'^❯\s*(\d+)\.\s*(.*)', line)
+            if option_match:
+                option_text = option_match.group(2).strip()
+                if not (option_text.startswith('(') and option_text.endswith(')')):
+                    current_capture.add_option(option_text)
+                    print(f"  + Option {option_match.group(1)}: {option_text[:50]}")
+            return current_capture, collecting_options
+        # If we see ❯ but no question mark, it's not a choice - reset collecting
+        elif line.startswith("❯"):
+            collecting_options = False
+            return current_capture, collecting_options
+
+        # If we're currently collecting options (started with ❯)
+        if collecting_options:
+            # Match continuation of numbered options: "2. Option text"
+            option_match = re.match(r'^\s*(\d+)\.\s*(.*)', line)
+            if option_match:
+                option_text = option_match.group(2).strip()
+                # Skip if it's just a hint in parentheses
+                if not (option_text.startswith('(') and option_text.endswith(')')):
+                    current_capture.add_option(option_text)
+                    print(f"  + Option {option_match.group(1)}: {option_text[:50]}")
+                return current_capture, collecting_options
+            # If line is a hint or instructions, skip but keep collecting
+            elif line.startswith('(') or 'Esc to cancel' in line or 'Tab to' in line:
+                return current_capture, collecting_options
+            # If line doesn't match option format and isn't a separator, stop collecting
+            elif line and not is_separator(line):
+                collecting_options = False
+
+        # Otherwise, append as continuation of text (skip separators)
+        if current_capture and line and not is_separator(line):
+            current_capture.append_text(line)
+            segments = current_capture.segments
+            add_line(segments, classify_line(line, segments), line)
+
+    return current_capture, collecting_options
@@ -0,0 +1,244 @@
+import difflib
+import math
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Turns a spoken answer ("the second one", "yes", "allow once") into an option
+# number for the menu Claude is showing, so the phone doesn't need a retry round
+# trip whenever the answer isn't a bare digit. Each menu gets a small index
+# (built once, cached) and resolving an answer is a few dict lookups.
+
+OptionMatch = namedtuple("OptionMatch", ["number", "confidence", "reason"])
+
+# Answers at or above this confidence are acted on without asking again
+MIN_CONFIDENCE = 0.6
+
+NUMBER_WORDS = {
+    'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4,
+    'five': 5, 'six': 6, 'seven': 7, 'eight': 8, 'nine': 9,
+    'ten': 10,
+}
+
+ORDINALS = {
+    'first': 1, 'second': 2, 'third': 3, 'fourth': 4, 'fifth': 5,
+    'sixth': 6, 'seventh': 7, 'eighth': 8, 'ninth': 9, 'tenth': 10,
+    '1st': 1, '2nd': 2, '3rd': 3, '4th': 4, '5th': 5,
+    '6th': 6, '7th': 7, '8th': 8, '9th': 9, '10th': 10,
+}
+
+# Words that carry no meaning in an answer ("I'll go with the second option please")
+FILLER = frozenset((
+    'the', 'a', 'an', 'one', 'option', 'number', 'choice', 'choose', 'pick',
+    'select', 'please', 'i', 'ill', 'id', 'want', 'go', 'with', 'take', 'lets',
+    'let', 'us', 'do', 'it', 'that', 'is', 'just', 'um', 'uh', 'like', 'ok',
+    'okay', 'so', 'hmm', 'answer', 'say', 'would', 'to',
+))
+
+YES_WORDS = frozenset(('yes', 'yeah', 'yep', 'yup', 'sure', 'ok', 'okay', 'affirmative', 'approve', 'accept'))
+NO_WORDS = frozenset(('no', 'nope', 'nah', 'negative', 'deny', 'reject', 'decline'))
+
+# "don't do that", "never", "stop": a refusal, even when the rest of the answer
+# happens to share words with a "yes" option ("Yes, and don't ask again")
+NEGATIONS = frozenset(('dont', 'not', 'never', 'stop', 'cant', 'wont', 'shouldnt'))
+
+# Idioms that agree despite a negation or "no" word in them ("sure, why not")
+AGREEING_IDIOMS = (
+    ('why', 'not'), ('dont', 'mind'), ('not', 'a', 'problem'), ('no', 'problem'), ('no', 'worries'),
+)
+
+# Negated answers that don't point at the "no" option stay below MIN_CONFIDENCE
+NEGATED_CONFIDENCE = 0.4
+
+# A number and option keywords that point at different options ("python three")
+CONFLICT_CONFIDENCE = 0.4
+
+# Fuzzy token matching cutoff (difflib ratio) for speech-to-text misspellings
+FUZZY_CUTOFF = 0.8
+
+_token_re = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return _token_re.findall(str(text).lower().replace("'", ""))
+
+
+class OptionIndex:
+    """Per-menu lookup tables: numbers, yes/no, and weighted option-text tokens"""
+
+    def __init__(self, options):
+        self.options = list(options)
+        self.count = len(self.options)
+        self.normalized = {}
+        self.tokens = []
+        self.yes_option = None
+        self.no_option = None
+
+        document_frequency = {}
+        for number, option in enumerate(self.options, 1):
+            words = tokenize(option)
+            self.normalized.setdefault(" ".join(words), number)
+            option_tokens = {w for w in words if w not in FILLER}
+            self.tokens.append(option_tokens)
+            for token in option_tokens:
+                document_frequency[token] = document_frequency.get(token, 0) + 1
+            if words and self.yes_option is None and words[0] == 'yes':
+                self.yes_option = number
+            if words and self.no_option is None and words[0] == 'no':
+                self.no_option = number
+        # Negation phrases the options themselves contain ("dont ask"), so
+        # quoting an option isn't mistaken for refusing it
+        self.quoted_negations = {
+            (a, b) for words in map(tokenize, self.options) for a, b in zip(words, words[1:]) if a in NEGATIONS
+        }
+
+        # Tokens unique to one option matter more than ones shared by all of them
+        n = max(self.count, 1)
+        self.weights = {
+            token: math.log(1 + n / df) / math.log(1 + n)
+            for token, df in document_frequency.items()
+        }
+        self.vocabulary = list(self.weights)
+
+    def resolve(self, answer):
+        """Best guess for which option the answer means, or None"""
+        words = tokenize(answer)
+        if not words:
+            return None
+
+        # Whole answer equals an option's text
+        exact = self.normalized.get(" ".join(words))
+        if exact:
+            return OptionMatch(exact, 1.0, "exact")
+
+        agrees = words[0] in YES_WORDS or _has_idiom(words)
+        if not agrees and self._is_negated(words):
+            return self._resolve_negated(words)
+
+        match = self._resolve_number(words)
+        if match:
+            # The words around the number must not name a different option
+            keywords = self._resolve_tokens([w for w in words if not _is_numeric(w)])
+            if keywords and keywords.number != match.number:
+                return OptionMatch(match.number, min(match.confidence, CONFLICT_CONFIDENCE), "conflict")
+            return match
+
+        match = self._resolve_tokens(words)
+        yes_no = self._resolve_yes_no(words)
+        if yes_no and (not match or yes_no.confidence >= match.confidence):
+            return yes_no
+        return match
+
+    def _is_negated(self, words):
+        for i, word in enumerate(words):
+            if word in NEGATIONS:
+                following = words[i + 1] if i + 1 < len(words) else None
+                if (word, following) not in self.quoted_negations:
+                    return True
+        return False
+
+    def _resolve_negated(self, words):
+        """A refusal means the "no" option; anything else is too uncertain to act on"""
+        match = self._resolve_number(words)
+        if match is None:
+            match = self._resolve_tokens([w for w in words if w not in NEGATIONS])
+        if match and match.number == self.no_option:
+            return match
+        if self.no_option and not any(_is_numeric(w) for w in words):
+            return OptionMatch(self.no_option, 0.7, "negation")
+        if match:
+            # "not the first one": we know what they don't want, not what they do
+            return OptionMatch(match.number, min(match.confidence, NEGATED_CONFIDENCE), "negated")
+        return None
+
+    def _resolve_number(self, words):
+        ordinals = [ORDINALS[w] for w in words if w in ORDINALS]
+        digits = [int(w) for w in words if w.isdigit()]
+        spelled = [NUMBER_WORDS[w] for w in words if w in NUMBER_WORDS]
+        if 'last' in words and self.count:
+            ordinals.append(self.count)
+
+        # "the second one": the ordinal wins over the filler "one"
+        candidates = ordinals or digits or spelled
+        if len(set(candidates)) != 1:
+            return None
+        number = candidates[0]
+        if not 1 <= number <= self.count:
+            return None
+
+        leftover = [w for w in words if w not in FILLER and not _is_numeric(w)]
+        # Extra content words make a number answer less certain ("two more tests")
+        confidence = 0.95 if not leftover else max(0.5, 0.95 - 0.15 * len(leftover))
+        return OptionMatch(number, confidence, "number")
+
+    def _resolve_yes_no(self, words):
+        if (words[0] in YES_WORDS or _has_idiom(words)) and self.yes_option:
+            return OptionMatch(self.yes_option, 0.85, "yes")
+        if words[0] in NO_WORDS and self.no_option:
+            return OptionMatch(self.no_option, 0.85, "no")
+        return None
+
+    def _resolve_tokens(self, words):
+        content = [w for w in words if w not in FILLER]
+        if not content or not self.vocabulary:
+            return None
+
+        matched = []
+        total_weight = 0.0
+        for word in content:
+            token = word if word in self.weights else None
+            similarity = 1.0
+            if token is None:
+                close = difflib.get_close_matches(word, self.vocabulary, n=1, cutoff=FUZZY_CUTOFF)
+                if close:
+                    token = close[0]
+                    similarity = difflib.SequenceMatcher(None, word, token).ratio()
+            if token is None:
+                # Unknown words dilute the score a little
+                total_weight += 0.5
+                continue
+            weight = self.weights[token]
+            total_weight += weight
+            matched.append((token, weight * similarity))
+
+        if not matched:
+            return None
+
+        scores = []
+        for number, option_tokens in enumerate(self.tokens, 1):
+            score = sum(w for token, w in matched if token in option_tokens)
+            scores.append((score / total_weight, number))
+        scores.sort(reverse=True)
+
+        best, number = scores[0]
+        runner_up = scores[1][0] if len(scores) > 1 else 0.0
+        # Penalize answers that fit two options almost equally well
+        confidence = best - 0.5 * runner_up
+        if confidence <= 0:
+            return None
+        return OptionMatch(number, round(min(confidence, 0.9), 3), "keywords")
+
+
+def _is_numeric(word):
+    return word in ORDINALS or word in NUMBER_WORDS or word == 'last' or word.isdigit()
+
+
+def _has_idiom(words):
+    """Whether the answer contains one of AGREEING_IDIOMS as consecutive words"""
+    for idiom in AGREEING_IDIOMS:
+        n = len(idiom)
+        if any(tuple(words[i:i + n]) == idiom for i in range(len(words) - n + 1)):
+            return True
+    return False
+
+
+@lru_cache(maxsize=32)
+def _index_for(options):
+    return OptionIndex(options)
+
+
+def resolve_option(answer, options):
+    """Resolve a spoken answer against a menu's options; returns OptionMatch or None"""
+    if not options:
+        return None
+    return _index_for(tuple(options)).resolve(answer)
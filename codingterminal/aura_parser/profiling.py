@@ -0,0 +1,165 @@
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import signal
+import time
+import tracemalloc
+
+# On-demand profiling for the running parser, no restart needed.
+#
+#   kill -USR1 <parser pid>   → cProfile capture for AURA_PROFILE_SECONDS (default 30)
+#   kill -USR2 <parser pid>   → tracemalloc snapshot diff over the same window
+#   {"type": "profile", "mode": "cpu" | "memory", "seconds": 10} over the websocket
+#
+# Reports go to logs/profile-<mode>-<timestamp>.txt (plus a .prof file for the
+# CPU capture, loadable with snakeviz or pstats). cProfile only sees the thread
+# that enabled it, so injections (typed from scheduler worker threads) run
+# under their own per-job profile that is merged into the CPU report.
+PROFILE_DIR = "logs"
+DEFAULT_SECONDS = 30
+MAX_SECONDS = 600
+
+# Hot paths broken out at the top of every CPU report
+HOT_FUNCTIONS = (
+    "process_line",
+    "finalize_capture",
+    "write_responses_json",
+    "send_to_websocket",
+    "inject_query_to_claude",
+    "inject_action_to_claude",
+    "inject_cancel_to_claude",
+)
+
+TOP_N = 30
+
+
+class Profiler:
+    """Runs at most one CPU and one memory capture at a time"""
+
+    def __init__(self, out_dir=PROFILE_DIR):
+        self.out_dir = out_dir
+        self._cpu = None
+        # Per-job profiles from worker threads during the current CPU capture
+        self._thread_profiles = []
+        self._memory = None
+        self._started_tracemalloc = False
+
+    @property
+    def busy(self):
+        return {"cpu": self._cpu is not None, "memory": self._memory is not None}
+
+    def start(self, mode, seconds=None):
+        """Start a capture that stops itself after `seconds`. Returns the report path."""
+        seconds = min(float(seconds or DEFAULT_SECONDS), MAX_SECONDS)
+        if mode == "cpu":
+            return self._start_cpu(seconds)
+        if mode == "memory":
+            return self._start_memory(seconds)
+        raise ValueError(f"Unknown profile mode '{mode}' (expected cpu or memory)")
+
+    def _report_path(self, mode, suffix="txt"):
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return os.path.join(self.out_dir, f"profile-{mode}-{stamp}.{suffix}")
+
+    def _start_cpu(self, seconds):
+        if self._cpu:
+            raise RuntimeError("CPU profile already running")
+        profile = cProfile.Profile()
+        self._thread_profiles = []
+        profile.enable()
+        path = self._report_path("cpu")
+        self._cpu = (profile, path, time.time())
+        asyncio.get_running_loop().call_later(seconds, self._stop_cpu)
+        print(f"⏱  CPU profiling for {seconds:.0f}s → {path}")
+        return path
+
+    def _stop_cpu(self):
+        profile, path, started = self._cpu
+        profile.disable()
+        self._cpu = None
+        thread_profiles, self._thread_profiles = self._thread_profiles, []
+
+        out = io.StringIO()
+        out.write(f"CPU profile, {time.time() - started:.1f}s window, "
+                  f"{len(thread_profiles)} worker jobs\n\n")
+
+        stats = pstats.Stats(profile, stream=out)
+        for thread_profile in thread_profiles:
+            stats.add(thread_profile)
+        stats.dump_stats(path[:-len("txt")] + "prof")
+        out.write("== Hot paths ==\n")
+        pattern = "|".join(HOT_FUNCTIONS)
+        stats.sort_stats("cumulative").print_stats(pattern)
+        out.write(f"\n== Top {TOP_N} by cumulative time ==\n")
+        stats.sort_stats("cumulative").print_stats(TOP_N)
+        out.write(f"\n== Top {TOP_N} by own time ==\n")
+        stats.sort_stats("tottime").print_stats(TOP_N)
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(out.getvalue())
+        print(f"✓ CPU profile written to {path}")
+
+    def call(self, fn):
+        """Run fn on the calling (worker) thread, profiled into the active CPU capture if any"""
+        if self._cpu is None:
+            return fn()
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+: the capture's profiler is process-wide and already sees this thread
+            return fn()
+        try:
+            return fn()
+        finally:
+            profile.disable()
+            self._thread_profiles.append(profile)
+
+    def _start_memory(self, seconds):
+        if self._memory:
+            raise RuntimeError("Memory profile already running")
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self._started_tracemalloc = True
+        path = self._report_path("memory")
+        self._memory = (tracemalloc.take_snapshot(), path, time.time())
+        asyncio.get_running_loop().call_later(seconds, self._stop_memory)
+        print(f"⏱  Memory tracing for {seconds:.0f}s → {path}")
+        return path
+
+    def _stop_memory(self):
+        before, path, started = self._memory
+        after = tracemalloc.take_snapshot()
+        self._memory = None
+        current, peak = tracemalloc.get_traced_memory()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+        ignore = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )
+        diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"Memory diff, {time.time() - started:.1f}s window\n")
+            f.write(f"Traced now {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n\n")
+            f.write(f"== Top {TOP_N} allocation changes ==\n")
+            for stat in diff[:TOP_N]:
+                f.write(f"{stat}\n")
+        print(f"✓ Memory profile written to {path}")
+
+    def install_signal_handlers(self, seconds=None):
+        """SIGUSR1 → CPU capture, SIGUSR2 → memory capture (POSIX only)"""
+        seconds = seconds or float(os.environ.get("AURA_PROFILE_SECONDS", DEFAULT_SECONDS))
+        loop = asyncio.get_running_loop()
+        for sig, mode in ((signal.SIGUSR1, "cpu"), (signal.SIGUSR2, "memory")):
+            loop.add_signal_handler(sig, self._start_from_signal, mode, seconds)
+
+    def _start_from_signal(self, mode, seconds):
+        try:
+            self.start(mode, seconds)
+        except RuntimeError as e:
+            print(f"⚠ {e}")
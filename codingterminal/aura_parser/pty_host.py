@@ -0,0 +1,292 @@
+import asyncio
+import codecs
+import fcntl
+import os
+import select
+import shlex
+import struct
+import subprocess
+import sys
+import termios
+import threading
+import tty
+
+from .capture import CaptureEnded, CaptureSource, normalize_newlines
+
+# Native PTY host mode: the parser spawns `claude` itself under a pseudo-terminal,
+# reads its output straight off the master fd and writes keystrokes back to it.
+#
+#   Claude <-pty-> parser.py            (no tmux, no pipe-pane, no log file)
+#
+# Humans can still watch and type: with AURA_PTY_MIRROR=<socket> the host accepts
+# mirror clients (`python3 -m aura_parser.pty_host attach <socket>`), which aura.sh runs
+# inside the usual tmux session so `tmux attach -t claude_aura` keeps working.
+DEFAULT_COMMAND = "claude"
+DEFAULT_MIRROR = "logs/claude_pty.sock"
+DEFAULT_COLS = 120
+DEFAULT_ROWS = 40
+
+# Output kept for mirror clients that attach late, so they see the current screen
+MIRROR_REPLAY_BYTES = 64 * 1024
+
+# tmux key names used by the injection code, as terminal byte sequences
+KEY_SEQUENCES = {
+    "Enter": b"\r",
+    "Escape": b"\x1b",
+    "Tab": b"\t",
+    "BSpace": b"\x7f",
+    "Up": b"\x1b[A",
+    "Down": b"\x1b[B",
+    "Right": b"\x1b[C",
+    "Left": b"\x1b[D",
+    "C-c": b"\x03",
+    "C-d": b"\x04",
+}
+
+
+def set_winsize(fd, rows, cols):
+    fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack("HHHH", rows, cols, 0, 0))
+
+
+def get_winsize(fd):
+    rows, cols, _, _ = struct.unpack("HHHH", fcntl.ioctl(fd, termios.TIOCGWINSZ, b"\0" * 8))
+    return rows, cols
+
+
+class PtyHost(CaptureSource):
+    """Run Claude under our own pseudo-terminal; acts as both capture source and input"""
+
+    name = "pty"
+
+    def __init__(self, command=None, mirror_path=None, tee_path=None,
+                 rows=DEFAULT_ROWS, cols=DEFAULT_COLS):
+        super().__init__(tee_path)
+        self.command = command or os.environ.get("AURA_PTY_COMMAND", DEFAULT_COMMAND)
+        self.mirror_path = mirror_path
+        self.rows = rows
+        self.cols = cols
+        self.process = None
+        self.master_fd = None
+        self._queue = asyncio.Queue()
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self._partial = ""
+        self._replay = bytearray()
+        # Scheduler worker threads and the mirror both write keystrokes
+        self._write_lock = threading.Lock()
+        self._mirrors = set()
+        self._mirror_server = None
+
+    @property
+    def input(self):
+        return self
+
+    async def start(self):
+        await super().start()
+        if self.process:
+            if self.process.poll() is not None:
+                raise CaptureEnded(f"'{self.command}' exited (code {self.process.poll()})")
+            return
+
+        master_fd, slave_fd = os.openpty()
+        set_winsize(slave_fd, self.rows, self.cols)
+
+        def make_controlling_tty():
+            os.setsid()
+            fcntl.ioctl(0, termios.TIOCSCTTY, 0)
+
+        env = dict(os.environ, TERM=os.environ.get("TERM", "xterm-256color"))
+        self.process = subprocess.Popen(
+            shlex.split(self.command),
+            stdin=slave_fd,
+            stdout=slave_fd,
+            stderr=slave_fd,
+            env=env,
+            preexec_fn=make_controlling_tty,
+            close_fds=True,
+        )
+        os.close(slave_fd)
+        os.set_blocking(master_fd, False)
+        self.master_fd = master_fd
+
+        asyncio.get_running_loop().add_reader(master_fd, self._on_output)
+        print(f"✓ Spawned '{self.command}' under PTY (pid {self.process.pid})")
+
+        if self.mirror_path:
+            if os.path.exists(self.mirror_path):
+                os.unlink(self.mirror_path)
+            self._mirror_server = await asyncio.start_unix_server(
+                self._handle_mirror, path=self.mirror_path
+            )
+            print(f"✓ PTY mirror listening on {self.mirror_path}")
+
+    def _on_output(self):
+        try:
+            data = os.read(self.master_fd, 65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            # EIO: the child closed its side of the terminal
+            data = b""
+
+        if not data:
+            asyncio.get_running_loop().remove_reader(self.master_fd)
+            if self._partial:
+                for line in self._emit(self._partial):
+                    self._queue.put_nowait(line)
+                self._partial = ""
+            self._queue.put_nowait(None)
+            return
+
+        self._forward_to_mirrors(data)
+
+        # A bare CR (spinner redraws) ends a line too, as in every other source
+        text = self._partial + normalize_newlines(self._decoder.decode(data))
+        *complete, self._partial = text.split("\n")
+        for line in complete:
+            for piece in self._emit(line + "\n"):
+                self._queue.put_nowait(piece)
+
+    async def lines(self):
+        await self.start()
+        while True:
+            line = await self._queue.get()
+            if line is None:
+                # Nothing will read or type into this terminal again; the daemon stops
+                code = await asyncio.to_thread(self.process.wait)
+                raise CaptureEnded(f"'{self.command}' exited (code {code})")
+            yield line
+
+    # Input side (same interface as TmuxInput in actions.py)
+
+    def send_text(self, text):
+        self._write(text.encode("utf-8"))
+
+    def send_key(self, key):
+        self._write(KEY_SEQUENCES.get(key, key.encode("utf-8")))
+
+    def _write(self, data):
+        """Write all of data to Claude's terminal. Blocks while the PTY is full, so
+        never call it on the event loop thread (see _handle_mirror)."""
+        with self._write_lock:
+            if self.master_fd is None:
+                raise OSError("PTY is not running")
+            view = memoryview(data)
+            while view:
+                try:
+                    written = os.write(self.master_fd, view)
+                except BlockingIOError:
+                    select.select([], [self.master_fd], [])
+                    continue
+                view = view[written:]
+
+    # Mirror clients
+
+    def _forward_to_mirrors(self, data):
+        self._replay += data
+        if len(self._replay) > MIRROR_REPLAY_BYTES:
+            del self._replay[:-MIRROR_REPLAY_BYTES]
+        for writer in list(self._mirrors):
+            if writer.is_closing():
+                self._mirrors.discard(writer)
+            else:
+                writer.write(data)
+
+    async def _handle_mirror(self, reader, writer):
+        # Mirror protocol: client sends its window size (rows, cols as two
+        # big-endian u16) once, then raw keystrokes; we send raw terminal output.
+        try:
+            header = await reader.readexactly(4)
+        except asyncio.IncompleteReadError:
+            writer.close()
+            return
+        rows, cols = struct.unpack(">HH", header)
+        if rows and cols and self.master_fd is not None:
+            set_winsize(self.master_fd, rows, cols)
+
+        writer.write(bytes(self._replay))
+        self._mirrors.add(writer)
+        print("✓ PTY mirror attached")
+        try:
+            while True:
+                data = await reader.read(1024)
+                if not data:
+                    break
+                await asyncio.to_thread(self._write, data)
+        finally:
+            self._mirrors.discard(writer)
+            writer.close()
+            print("⚠ PTY mirror detached")
+
+    async def close(self):
+        if self._mirror_server:
+            self._mirror_server.close()
+            self._mirror_server = None
+            if os.path.exists(self.mirror_path):
+                os.unlink(self.mirror_path)
+        if self.master_fd is not None:
+            asyncio.get_running_loop().remove_reader(self.master_fd)
+            os.close(self.master_fd)
+            self.master_fd = None
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+        await super().close()
+
+    def describe(self):
+        mirror = f", mirror {self.mirror_path}" if self.mirror_path else ""
+        return f"pty '{self.command}'{mirror}"
+
+
+async def attach(path):
+    """Connect this terminal to a running PtyHost mirror socket"""
+    reader, writer = await asyncio.open_unix_connection(path)
+    stdin_fd = sys.stdin.fileno()
+    stdout_fd = sys.stdout.fileno()
+
+    rows, cols = get_winsize(stdout_fd) if os.isatty(stdout_fd) else (0, 0)
+    writer.write(struct.pack(">HH", rows, cols))
+
+    loop = asyncio.get_running_loop()
+    done = asyncio.Event()
+
+    def on_stdin():
+        data = os.read(stdin_fd, 1024)
+        if not data:
+            done.set()
+            return
+        writer.write(data)
+
+    old_attrs = termios.tcgetattr(stdin_fd) if os.isatty(stdin_fd) else None
+    if old_attrs:
+        tty.setraw(stdin_fd)
+    loop.add_reader(stdin_fd, on_stdin)
+
+    async def pump_output():
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            os.write(stdout_fd, data)
+        done.set()
+
+    output_task = asyncio.create_task(pump_output())
+    try:
+        await done.wait()
+    finally:
+        loop.remove_reader(stdin_fd)
+        output_task.cancel()
+        writer.close()
+        if old_attrs:
+            termios.tcsetattr(stdin_fd, termios.TCSADRAIN, old_attrs)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "attach":
+        print("Usage: python3 -m aura_parser.pty_host attach [socket]")
+        sys.exit(1)
+    try:
+        asyncio.run(attach(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_MIRROR))
+    except (ConnectionRefusedError, FileNotFoundError):
+        print("❌ No PTY host listening. Start the parser with AURA_CAPTURE=pty")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,122 @@
+import sys
+
+from .segments import add_line, finalize_segments, new_segments, segment_view
+
+# One ⏺ response. Long answers arrive one terminal line at a time, so the text
+# is kept as a list of lines while the capture is open and joined once when it
+# is finalized (`text += " " + line` re-copied the whole answer on every line).
+# Option strings are interned: the same few menus ("Yes", "No, and tell Claude
+# what to do differently (esc)") repeat across thousands of stored responses.
+#
+# A Capture reads like the dict it replaces (capture["text"], capture.get(...),
+# dict(capture)) and serializes to the same JSON via to_dict / json_default.
+# `segments` repeats the content of `text`, so it is only sent to the relay
+# (which filters it per client) and left out of responses.json.
+# `spoken` (the voice summary, see summary.py) is only present once set.
+FIELDS = ("text", "options", "segments")
+OPTIONAL_FIELDS = ("spoken",)
+
+
+class Capture:
+    __slots__ = ("_text", "options", "segments", "has_question", "spoken")
+
+    def __init__(self, first_line="", options=None, segments=None):
+        # list of lines while open, one str once finalized
+        self._text = [first_line]
+        self.options = options if options is not None else []
+        self.segments = new_segments(first_line) if segments is None else segments
+        # Whether the text so far contains a "?" (only questions get option menus)
+        self.has_question = "?" in first_line
+        self.spoken = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Capture from its JSON form (e.g. responses.json on resume)"""
+        capture = cls(options=[sys.intern(o) for o in data.get("options") or []],
+                      segments=list(data.get("segments") or []))
+        capture._text = data.get("text", "")
+        capture.has_question = "?" in capture._text
+        capture.spoken = data.get("spoken")
+        return capture
+
+    @property
+    def text(self):
+        text = self._text
+        if not isinstance(text, list):
+            return text
+        if len(text) > 1:
+            # Reading an open capture (the responses.json flush) keeps what it joined
+            text[:] = [" ".join(text)]
+        return text[0]
+
+    @property
+    def finalized(self):
+        return not isinstance(self._text, list)
+
+    def append_text(self, line):
+        """Add a continuation line; O(1) until the capture is finalized"""
+        self._text.append(line)
+        if "?" in line:
+            self.has_question = True
+
+    def add_option(self, option_text):
+        option_text = sys.intern(option_text)
+        self.options.append(option_text)
+        add_line(self.segments, "options", option_text)
+
+    def finalize(self):
+        """Join the text and segments once; later reads are free"""
+        if not self.finalized:
+            self._text = " ".join(self._text)
+        finalize_segments(self.segments)
+        return self
+
+    def to_dict(self, segments=True):
+        data = {"text": self.text, "options": list(self.options)}
+        if segments:
+            data["segments"] = [segment_view(s) for s in self.segments]
+        if self.spoken is not None:
+            data["spoken"] = self.spoken
+        return data
+
+    # Read-only mapping interface, so code written against capture dicts keeps working
+    def keys(self):
+        return FIELDS + tuple(k for k in OPTIONAL_FIELDS if getattr(self, k) is not None)
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in FIELDS or (key in OPTIONAL_FIELDS and getattr(self, key) is not None)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self else default
+
+    def __eq__(self, other):
+        if isinstance(other, Capture):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        text = self.text
+        return f"Capture({text[:40]!r}{'...' if len(text) > 40 else ''}, options={len(self.options)})"
+
+
+def json_default(obj):
+    """`default=` hook for json.dump(s) so Captures serialize as plain dicts"""
+    if isinstance(obj, Capture):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_default_stored(obj):
+    """json_default for responses.json: captures without their segments"""
+    if isinstance(obj, Capture):
+        return obj.to_dict(segments=False)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
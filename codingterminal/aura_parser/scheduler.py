@@ -0,0 +1,154 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+
+# Inbound work for Claude's terminal. Phones can send faster than keystrokes
+# can be typed, so injections are queued and typed by one worker per input
+# target (tmux session or PTY); two jobs never interleave their keystrokes.
+#
+#   cancel  Ctrl-C, runs before anything else that is waiting
+#   action  answer to the menu Claude is showing
+#   query   new prompt text
+#
+# Jobs of the same priority run in arrival order. A query identical to one
+# still waiting is coalesced into it, and a cancel drops waiting actions (the
+# menu they answer is gone). A job that has started always finishes; the
+# injection helpers block, so they run in a thread and the event loop keeps
+# parsing Claude's output meanwhile.
+CANCEL, ACTION, QUERY = 0, 1, 2
+KINDS = {CANCEL: "cancel", ACTION: "action", QUERY: "query"}
+
+# Recent wait times kept per kind for the stats percentiles
+WAIT_SAMPLES = 512
+
+
+def lane_key(claude_input):
+    """Jobs for the same tmux session share a lane; any other input is its own lane"""
+    session = getattr(claude_input, "session", None)
+    return ("tmux", session) if session else claude_input
+
+
+class _Job:
+    __slots__ = ("priority", "kind", "fn", "on_done", "key", "enqueued")
+
+    def __init__(self, priority, fn, on_done, key):
+        self.priority = priority
+        self.kind = KINDS[priority]
+        self.fn = fn
+        self.on_done = on_done
+        self.key = key
+        self.enqueued = time.monotonic()
+
+
+class _Lane:
+    def __init__(self):
+        self.heap = []
+        self.wakeup = asyncio.Event()
+        self.worker = None
+        self.running = None
+
+
+class InputScheduler:
+    """Priority queues of keystroke jobs, one serial worker per input target"""
+
+    def __init__(self, runner=None):
+        # Calls a job's fn on the worker thread (the profiler wraps it to see injections)
+        self.runner = runner
+        self._lanes = {}
+        self._order = itertools.count()
+        self.submitted = dict.fromkeys(KINDS.values(), 0)
+        self.completed = dict.fromkeys(KINDS.values(), 0)
+        self.failed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self._waits = {kind: deque(maxlen=WAIT_SAMPLES) for kind in KINDS.values()}
+
+    def submit(self, lane, priority, fn, on_done=None, coalesce_key=None):
+        """Queue fn (blocking, returns success) for a lane. Returns False if coalesced into a waiting job.
+
+        on_done is an optional coroutine function called with fn's result.
+        """
+        queue = self._lanes.get(lane)
+        if queue is None:
+            queue = self._lanes[lane] = _Lane()
+
+        if coalesce_key is not None and any(job.key == coalesce_key for _, _, job in queue.heap):
+            self.coalesced += 1
+            return False
+        if priority == CANCEL:
+            kept = [entry for entry in queue.heap if entry[2].priority != ACTION]
+            self.dropped += len(queue.heap) - len(kept)
+            heapq.heapify(kept)
+            queue.heap = kept
+
+        job = _Job(priority, fn, on_done, coalesce_key)
+        heapq.heappush(queue.heap, (priority, next(self._order), job))
+        self.submitted[job.kind] += 1
+        self.max_depth = max(self.max_depth, self.depth())
+        queue.wakeup.set()
+        if queue.worker is None or queue.worker.done():
+            queue.worker = asyncio.create_task(self._work(queue))
+        return True
+
+    async def _work(self, queue):
+        while True:
+            while not queue.heap:
+                queue.wakeup.clear()
+                await queue.wakeup.wait()
+            _, _, job = heapq.heappop(queue.heap)
+            self._waits[job.kind].append(time.monotonic() - job.enqueued)
+            queue.running = job.kind
+            try:
+                if self.runner:
+                    ok = await asyncio.to_thread(self.runner, job.fn)
+                else:
+                    ok = await asyncio.to_thread(job.fn)
+            except Exception as e:
+                print(f"❌ {job.kind} injection failed: {e}")
+                ok = False
+            finally:
+                queue.running = None
+            if ok:
+                self.completed[job.kind] += 1
+            else:
+                self.failed += 1
+            if job.on_done:
+                try:
+                    await job.on_done(ok)
+                except Exception as e:
+                    print(f"⚠ Could not report {job.kind} result: {e}")
+
+    def depth(self):
+        return sum(len(queue.heap) for queue in self._lanes.values())
+
+    def stats(self):
+        waiting = dict.fromkeys(KINDS.values(), 0)
+        for queue in self._lanes.values():
+            for _, _, job in queue.heap:
+                waiting[job.kind] += 1
+        return {
+            "depth": sum(waiting.values()),
+            "waiting": waiting,
+            "max_depth": self.max_depth,
+            "running": [queue.running for queue in self._lanes.values() if queue.running],
+            "submitted": dict(self.submitted),
+            "completed": dict(self.completed),
+            "failed": self.failed,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "wait_ms": {kind: _wait_summary(samples) for kind, samples in self._waits.items()},
+        }
+
+
+def _wait_summary(samples):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+
+    def pct(p):
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 1)
+
+    return {"p50": pct(50), "p95": pct(95), "max": round(ordered[-1] * 1000, 1)}
@@ -0,0 +1,117 @@
+import re
+
+# Typed segments of a capture, built line by line alongside the flat `text`:
+#
+#   prose    - Claude's explanation, what the voice pipeline should speak
+#   code     - fenced or code-looking lines
+#   diff     - +/- lines from edits (with or without Claude's line numbers)
+#   tool     - tool invocations (⏺ Bash(npm test)) and their ⎿ output
+#   options  - the numbered choices of a prompt
+#
+# Each segment is {"type", "text", "bytes"}; consecutive lines of the same type
+# share one segment. Clients send {"type": "subscribe", "segments": [...]} to
+# the relay to receive only the types they render or speak; the relay applies
+# filter_capture per client (see examples/subscriptions.py).
+SEGMENT_TYPES = ("prose", "code", "diff", "tool", "options")
+
+# Code and diff keep their line structure; the rest reads as running text
+_LINE_JOINERS = {"code": "\n", "diff": "\n", "options": "\n", "prose": " ", "tool": "\n"}
+
+_tool_call_re = re.compile(r"^[A-Z][A-Za-z]*\(.*\)$")
+# Claude's numbered diff gutter ("12 + foo") and unified diff headers are always
+# diff; a bare "+ "/"- " line is usually a markdown bullet, so it only counts as
+# diff inside an edit (after an Update(...)/Edit(...) tool line or another diff line)
+_diff_re = re.compile(r"^\d+\s+[+-](?:\s|$)|^@@ .* @@|^(?:\+\+\+|---) [ab/]")
+_bare_diff_re = re.compile(r"^[+-](?:\s|$)")
+_edit_tool_re = re.compile(r"^(?:Update|Edit|MultiEdit|Write|Create)\(")
+_code_re = re.compile(
+    r"^(?:def |class |import |from \S+ import |function |const |let |var |return\b|if \(|for \(|"
+    r"#include|\$ |>>> |[}\])];?$)|[{;]$"
+)
+_fence = "```"
+
+
+def new_segments(first_line):
+    """Segments for a capture whose ⏺ line is first_line"""
+    if not first_line:
+        return []
+    kind = "tool" if _tool_call_re.match(first_line) else "prose"
+    return [_new_segment(kind, first_line)]
+
+
+def _new_segment(kind, line):
+    # While a capture is open a segment keeps its lines in a list (joined once
+    # by finalize_segments) and whether a ``` fence is still open
+    return {"type": kind, "parts": [line], "open_fence": line.startswith(_fence)}
+
+
+def classify_line(line, segments):
+    """Segment type for a continuation line, given the segments so far"""
+    last = segments[-1] if segments else None
+    if last and last["type"] == "code" and last.get("open_fence"):
+        return "code"
+    if line.startswith(_fence):
+        return "code"
+    if line.startswith("⎿"):
+        return "tool"
+    if _diff_re.match(line) or (_bare_diff_re.match(line) and _in_edit(last)):
+        return "diff"
+    if _code_re.search(line):
+        return "code"
+    # Tool output continues until Claude starts talking again
+    if last and last["type"] == "tool" and not line[:1].isupper():
+        return "tool"
+    return "prose"
+
+
+def _in_edit(last):
+    """Whether the previous segment is a diff or an edit tool's call and output"""
+    if not last:
+        return False
+    if last["type"] == "diff":
+        return True
+    first = last["parts"][0] if "parts" in last else last["text"]
+    return last["type"] == "tool" and bool(_edit_tool_re.match(first))
+
+
+def add_line(segments, kind, line):
+    """Append a line to the segment list, extending the last segment if it has the same type"""
+    if segments and segments[-1]["type"] == kind:
+        segment = segments[-1]
+        segment["parts"].append(line)
+        if line.startswith(_fence):
+            segment["open_fence"] = not segment["open_fence"]
+    else:
+        segments.append(_new_segment(kind, line))
+
+
+def segment_view(segment):
+    """{"type", "text"} of a segment, joining its lines if it is still open"""
+    if "parts" not in segment:
+        return segment
+    kind = segment["type"]
+    parts = segment["parts"]
+    if len(parts) > 1:
+        parts[:] = [_LINE_JOINERS[kind].join(parts)]
+    return {"type": kind, "text": parts[0]}
+
+
+def finalize_segments(segments):
+    """Join each segment's lines and record its UTF-8 size once the capture is complete"""
+    for i, segment in enumerate(segments):
+        segment = segments[i] = segment_view(segment)
+        segment["bytes"] = len(segment["text"].encode("utf-8"))
+    return segments
+
+
+def filter_capture(capture, types):
+    """Copy of a capture with only the subscribed segment types; `text` is rebuilt from them"""
+    if not types or "segments" not in capture:
+        return capture
+    segments = [s for s in capture.get("segments", []) if s["type"] in types]
+    filtered = dict(capture)
+    filtered["segments"] = segments
+    filtered["text"] = " ".join(s["text"] for s in segments if s["type"] != "options")
+    if "options" not in types:
+        filtered["options"] = []
+    return filtered
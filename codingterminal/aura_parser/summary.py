@@ -0,0 +1,176 @@
+import os
+import re
+import time
+from collections import Counter
+
+# Short extractive summary of a long response for the voice pipeline, sent as
+# `spoken` next to the full text so phones can synthesize a few sentences
+# instead of a multi-kilobyte answer. Only prose is summarized (code, diffs and
+# tool output are never spoken). Sentences are scored by how many of the
+# response's frequent words they contain, with a bonus for the opening
+# sentence; the best ones are read back in their original order. When Claude
+# ends on a question (the prompt above an options menu) that question is always
+# kept, and `options` itself is never touched.
+#
+# Each summary has a CPU budget, checked after sentence splitting and every
+# few sentences while tokenizing and scoring; once it is spent the leading
+# sentences are used instead. Whitespace normalization and sentence splitting
+# run unchecked, which is why the input is capped at MAX_INPUT_CHARS first
+# (counted as `truncated` in stats). Enable with AURA_SPOKEN_SUMMARY=1.
+DEFAULT_SENTENCES = 3
+DEFAULT_MAX_CHARS = 400
+DEFAULT_BUDGET_MS = 5.0
+
+# Longer answers are only scanned this far; the gist is rarely at the end
+MAX_INPUT_CHARS = 20000
+
+# Sentences tokenized or scored between deadline checks
+CHECK_EVERY = 32
+
+_sentence_re = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])")
+_word_re = re.compile(r"[a-z][a-z0-9']+")
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between both but
+by can could did do does doing done down during each few for from further had has have having he her here hers
+him his how i if in into is it its itself just let me more most my no nor not now of off on once only or other
+our out over own same she should so some such than that the their them then there these they this those through
+to too under until up us very was we were what when where which while who whom why will with would you your
+i'll i'm i've it's let's that's there's we'll we're you'll you're don't doesn't didn't can't won't isn't
+""".split())
+
+
+def split_sentences(text):
+    return [s.strip() for s in _sentence_re.split(text) if s.strip()]
+
+
+def spoken_source(capture):
+    """The text worth speaking: prose segments, or the flat text for captures without segments"""
+    segments = capture.get("segments")
+    if segments:
+        return " ".join(s["text"] for s in segments if s["type"] == "prose")
+    return capture.get("text", "")
+
+
+class Summarizer:
+    """Extractive summaries within a per-response CPU budget, with counters for stats"""
+
+    def __init__(self, max_sentences=DEFAULT_SENTENCES, max_chars=DEFAULT_MAX_CHARS, budget_ms=DEFAULT_BUDGET_MS):
+        self.max_sentences = max(1, max_sentences)
+        self.max_chars = max_chars
+        self.budget = budget_ms / 1000
+        self.summarized = 0
+        self.passthrough = 0
+        self.over_budget = 0
+        self.truncated = 0
+        self.total_cpu = 0.0
+        self.max_cpu = 0.0
+        self.bytes_saved = 0
+
+    def summarize(self, text, keep_question=False):
+        """Spoken version of text: itself if already short, else its best sentences"""
+        deadline = time.process_time() + self.budget
+        if len(text) > MAX_INPUT_CHARS:
+            self.truncated += 1
+            text = text[:MAX_INPUT_CHARS]
+        text = " ".join(text.split())
+        sentences = split_sentences(text)
+        if len(sentences) <= self.max_sentences and len(text) <= self.max_chars:
+            return text
+
+        question = len(sentences) - 1 if keep_question and sentences[-1].endswith("?") else None
+        picked = self._pick(sentences, question, deadline)
+        if picked is None:
+            # Out of CPU budget: the opening sentences are the cheapest fair guess
+            self.over_budget += 1
+            picked = list(range(min(self.max_sentences, len(sentences))))
+            if question is not None and question not in picked:
+                picked[-1] = question
+        return self._fit([sentences[i] for i in sorted(picked)])
+
+    def _pick(self, sentences, question, deadline):
+        """Indices of the highest-scoring sentences, or None if the deadline passed"""
+        words = []
+        frequency = Counter()
+        for i, sentence in enumerate(sentences):
+            if i % CHECK_EVERY == 0 and time.process_time() > deadline:
+                return None
+            sentence_words = [w for w in _word_re.findall(sentence.lower()) if w not in STOPWORDS]
+            frequency.update(sentence_words)
+            words.append(sentence_words)
+        if not frequency:
+            return None
+        top = frequency.most_common(1)[0][1]
+
+        scores = []
+        for i, sentence_words in enumerate(words):
+            if i % CHECK_EVERY == 0 and time.process_time() > deadline:
+                return None
+            score = sum(frequency[w] for w in set(sentence_words)) / top / (len(sentence_words) ** 0.5 or 1)
+            if i == 0:
+                score *= 1.5
+            scores.append(score)
+
+        slots = self.max_sentences - (question is not None)
+        picked = []
+        seen = set()
+        for i in sorted(range(len(sentences)), key=lambda i: -scores[i]):
+            if len(picked) >= slots:
+                break
+            # Redrawn or repeated sentences are only spoken once
+            if i != question and sentences[i] not in seen:
+                seen.add(sentences[i])
+                picked.append(i)
+        if question is not None:
+            picked.append(question)
+        return picked
+
+    def _fit(self, sentences):
+        """Join sentences, dropping from the middle (never the first or the question) to fit max_chars"""
+        while len(sentences) > 2 and len(" ".join(sentences)) > self.max_chars:
+            del sentences[-2]
+        spoken = " ".join(sentences)
+        if len(spoken) > self.max_chars:
+            spoken = spoken[:self.max_chars - 1].rsplit(" ", 1)[0] + "…"
+        return spoken
+
+    def attach(self, capture):
+        """Set capture.spoken from its prose; returns the spoken text"""
+        started = time.process_time()
+        source = spoken_source(capture)
+        spoken = self.summarize(source, keep_question=bool(capture.get("options")))
+        elapsed = time.process_time() - started
+
+        self.total_cpu += elapsed
+        self.max_cpu = max(self.max_cpu, elapsed)
+        if spoken == " ".join(source.split()):
+            self.passthrough += 1
+        else:
+            self.summarized += 1
+        self.bytes_saved += max(0, len(capture.get("text", "").encode("utf-8")) - len(spoken.encode("utf-8")))
+        capture.spoken = spoken
+        return spoken
+
+    def stats(self):
+        count = self.summarized + self.passthrough
+        return {
+            "summarized": self.summarized,
+            "passthrough": self.passthrough,
+            "over_budget": self.over_budget,
+            "truncated": self.truncated,
+            "avg_cpu_ms": round(self.total_cpu / count * 1000, 2) if count else 0,
+            "max_cpu_ms": round(self.max_cpu * 1000, 2),
+            "budget_ms": self.budget * 1000,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+def make_summarizer():
+    """Summarizer configured from AURA_SPOKEN_* variables, or None unless AURA_SPOKEN_SUMMARY is set"""
+    if os.environ.get("AURA_SPOKEN_SUMMARY", "").lower() not in ("1", "true", "yes", "on"):
+        return None
+    return Summarizer(
+        max_sentences=int(os.environ.get("AURA_SPOKEN_SENTENCES", DEFAULT_SENTENCES)),
+        max_chars=int(os.environ.get("AURA_SPOKEN_MAX_CHARS", DEFAULT_MAX_CHARS)),
+        budget_ms=float(os.environ.get("AURA_SPOKEN_BUDGET_MS", DEFAULT_BUDGET_MS)),
+    )
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Time and memory benchmark for capture accumulation.
+
+Feeds single responses of several thousand continuation lines through
+process_line and compares against the old representation (a dict whose
+text and segment strings grow with `+=`), then runs the same lines through
+the daemon's real per-line path (parse_log_file, including the
+responses.json flush) with the old flush-every-line behaviour and with the
+default throttle, and finally measures what a long session's worth of
+stored responses costs in memory.
+
+    python examples/bench_capture.py
+    python examples/bench_capture.py --lines 2000 8000 32000 --stored 20000
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aura_parser import segments as segments_module
+from aura_parser.lines import (
+    clean_line, finalize_capture, ignore_prefixes, is_separator, noise_patterns, process_line,
+)
+from aura_parser.daemon import DEFAULT_FLUSH_INTERVAL, BridgeState, parse_log_file
+from aura_parser.response import Capture
+
+OPTIONS = ["Yes", "Yes, and don't ask again this session", "No, and tell Claude what to do differently (esc)"]
+
+
+def response_lines(n):
+    """One ⏺ response of n lines mixing prose, a fenced code block and a diff"""
+    lines = ["⏺ Here is what I changed and why it matters for the parser."]
+    for i in range(n):
+        kind = i % 40
+        if kind < 24:
+            lines.append(f"The tail loop now handles case {i} without re-reading the whole buffer each time.")
+        elif kind == 24 or kind == 31:
+            lines.append("```python")
+        elif kind < 31:
+            lines.append(f"value_{i} = compute({i}, cache=True);")
+        else:
+            lines.append(f"{i} + new_line_{i} = True")
+    return lines
+
+
+def legacy_classify(line, segments):
+    """classify_line as it was, recounting ``` fences in the whole segment text every line"""
+    last = segments[-1] if segments else None
+    if last and last["type"] == "code" and sum(1 for l in last["text"].split("\n") if l.startswith("```")) % 2 == 1:
+        return "code"
+    if line.startswith("```"):
+        return "code"
+    if line.startswith("⎿"):
+        return "tool"
+    if segments_module._diff_re.match(line) or (
+            segments_module._bare_diff_re.match(line) and segments_module._in_edit(last)):
+        return "diff"
+    if segments_module._code_re.search(line):
+        return "code"
+    if last and last["type"] == "tool" and not line[:1].isupper():
+        return "tool"
+    return "prose"
+
+
+def legacy_accumulate(lines):
+    """The previous dict representation: every continuation line re-copies text and segment"""
+    first_line = clean_line(lines[0])[1:].strip()
+    capture = {"text": first_line, "options": [], "segments": [{"type": "prose", "text": first_line}]}
+    for line in lines[1:]:
+        line = clean_line(line)
+        if not line or line.startswith(ignore_prefixes) or any(p in line for p in noise_patterns):
+            continue
+        if is_separator(line):
+            continue
+        capture["text"] += " " + line
+        segments = capture["segments"]
+        kind = legacy_classify(line, segments)
+        if segments and segments[-1]["type"] == kind:
+            segments[-1]["text"] += ("\n" if kind != "prose" else " ") + line
+        else:
+            segments.append({"type": kind, "text": line})
+    for segment in capture["segments"]:
+        segment["bytes"] = len(segment["text"].encode("utf-8"))
+    return capture
+
+
+def current_accumulate(lines):
+    responses = []
+    capture, collecting = None, False
+    with contextlib.redirect_stdout(io.StringIO()):
+        for line in lines:
+            capture, collecting = process_line(line, capture, collecting, responses)
+        finalize_capture(capture, responses)
+    return responses[-1]
+
+
+class ListSource:
+    """Capture source that yields prepared lines as fast as the parser takes them"""
+
+    def __init__(self, lines):
+        self._lines = lines
+
+    async def lines(self):
+        for line in self._lines:
+            yield line
+
+
+def daemon_path(lines, flush_interval):
+    """Seconds for parse_log_file to take the lines (no websocket, no history), and the JSON writes it made"""
+    with tempfile.TemporaryDirectory() as tmp:
+        state = BridgeState(json_file=os.path.join(tmp, "responses.json"), dedupe_window=0)
+        state.writer.interval = flush_interval
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            asyncio.run(parse_log_file(None, state, ListSource(lines + ["⏺ done"])))
+        return time.perf_counter() - started, state.writer.writes
+
+
+def measure(fn, arg):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn(arg)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def stored_size(make, count):
+    """Bytes retained by `count` short stored responses"""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = [make(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def menu_capture(i):
+    capture = Capture(f"Do you want to run step {i}?")
+    for option in OPTIONS:
+        # Options come off the terminal as fresh strings (Capture interns them)
+        capture.add_option("".join(list(option)))
+    return capture.finalize()
+
+
+def as_dict(i):
+    # What the dict representation held for the same response: fresh strings everywhere
+    return json.loads(json.dumps(menu_capture(i).to_dict()))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark capture accumulation")
+    arg_parser.add_argument("--lines", type=int, nargs="+", default=[1000, 4000, 16000])
+    arg_parser.add_argument("--stored", type=int, default=10000, help="stored responses for the memory check")
+    args = arg_parser.parse_args()
+
+    print(f"{'lines':>8} {'legacy s':>10} {'capture s':>10} {'speedup':>8} {'legacy peak':>12} {'capture peak':>13}")
+    for n in args.lines:
+        lines = response_lines(n)
+        old, old_s, old_peak = measure(legacy_accumulate, lines)
+        new, new_s, new_peak = measure(current_accumulate, lines)
+        assert new == old, "result differs from the legacy representation"
+        print(f"{n:>8} {old_s:>10.4f} {new_s:>10.4f} {old_s / max(new_s, 1e-9):>7.1f}x "
+              f"{old_peak / 1e6:>10.2f}MB {new_peak / 1e6:>11.2f}MB")
+
+    print(f"\n{'lines':>8} {'every line s':>13} {'writes':>7} {'throttled s':>12} {'writes':>7} {'speedup':>8}")
+    for n in args.lines:
+        lines = response_lines(n)
+        old_s, old_writes = daemon_path(lines, 0)
+        new_s, new_writes = daemon_path(lines, DEFAULT_FLUSH_INTERVAL)
+        print(f"{n:>8} {old_s:>13.3f} {old_writes:>7} {new_s:>12.3f} {new_writes:>7} {old_s / max(new_s, 1e-9):>7.1f}x")
+
+    old_bytes = stored_size(as_dict, args.stored)
+    new_bytes = stored_size(menu_capture, args.stored)
+    print(f"\n{args.stored} stored menu responses: dict {old_bytes / 1e6:.2f} MB, "
+          f"Capture {new_bytes / 1e6:.2f} MB ({old_bytes / max(new_bytes, 1):.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,26 +3,52 @@ import uvicorn
 import asyncio
 import json
 
+from replay_buffer import ReplayBuffer
+from subscriptions import Subscriptions
+
 app = FastAPI()
 connected = set()
 
+# Last responses and pending prompt, sent to clients when they connect
+replay = ReplayBuffer()
+
+# Segment types each client asked for (filtered here, per client)
+subscriptions = Subscriptions()
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
     connected.add(websocket)
     try:
+        snapshot = replay.snapshot()
+        if snapshot:
+            await websocket.send_text(json.dumps(snapshot))
+
         while True:
             msg = await websocket.receive_text()
             print("Received from client:", msg)
+            try:
+                payload = json.loads(msg)
+            except json.JSONDecodeError:
+                payload = None
+            reply = subscriptions.handle(websocket, payload)
+            if reply:
+                await websocket.send_text(json.dumps(reply))
+                continue
+            replay.record(payload)
     except WebSocketDisconnect:
         pass
     finally:
         connected.remove(websocket)
+        subscriptions.drop(websocket)
 
 async def broadcast_new_data(new_data):
+    replay.record({"type": "response", "content": new_data})
     if connected:
-        payload = json.dumps({"type": "response", "content": [new_data]})
-        await asyncio.gather(*(ws.send_text(payload) for ws in connected))
+        message = {"type": "response", "content": [new_data]}
+        payload = json.dumps(message)
+        # Each client gets the response filtered by its own subscription
+        await asyncio.gather(*(ws.send_text(subscriptions.payload_for(ws, message, payload)) for ws in connected))
 
 async def simulate_data():
     counter = 1
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Synthetic load generator and soak test for the parser + relay.
+
+Writes fake Claude TUI output (ANSI codes, spinners, ⏺ blocks, option menus)
+into the session log at a fixed rate, drives N fake phone clients that send
+query/action traffic through the relay, and reports throughput, latency
+percentiles, memory growth and dropped messages.
+
+Typical soak run against the real bridge (backend on ws://localhost:8765):
+    python3 parser.py                # tails logs/claude_session.log
+    python3 examples/load_test.py --rate 0.5 --clients 20 --duration 3h
+
+Or let this script host a minimal broadcast relay (every message goes to
+every other client) in a child process, so its memory is measured apart
+from the load generator:
+    python3 examples/load_test.py --serve --duration 10m
+
+Phone traffic reaches the parser, which will try to inject it. Run the parser
+with the default file source (AURA_CAPTURE unset or AURA_CAPTURE=file) and no
+`claude_aura` tmux session: it reads the synthetic log, and injection fails
+harmlessly. Never run the soak against a real Claude session. (The pty source
+does not work here: the parser would read the PTY, not the log this writes.)
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import re
+import time
+
+import websockets
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+WS_URL = "ws://localhost:8765"
+LOG_FILE = "logs/claude_session.log"
+
+# Markers embedded in synthetic traffic so receivers can compute latency and gaps
+RESPONSE_MARKER = re.compile(r"\[load r=(\d+) t=([\d.]+)\]")
+TICK = 0.1
+
+# Responses this far behind the newest one are no longer waited for
+GAP_WINDOW = 10000
+
+SPINNERS = ["✻ Flibbertigibbeting…", "✽ Prestidigitating…", "✢ Cascading…"]
+WORDS = ("the parser reads pane output and sends each response to the relay so "
+         "the phone can speak it while claude keeps working on the code base").split()
+
+
+def parse_duration(value):
+    """'90' / '90s' / '15m' / '3h' → seconds"""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smh]?)", value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid duration '{value}'")
+    return float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class SeqTracker:
+    """Which sequence numbers arrived, in bounded memory: the highest one seen
+    plus the gaps below it that may still fill in (up to GAP_WINDOW back)"""
+
+    def __init__(self, gap_window=GAP_WINDOW):
+        self.gap_window = gap_window
+        self.top = -1
+        self.gaps = set()
+        self.unique = 0
+        self.duplicates = 0
+
+    def add(self, seq):
+        if seq > self.top:
+            self.gaps.update(range(max(self.top + 1, seq - self.gap_window), seq))
+            self.top = seq
+            if len(self.gaps) > self.gap_window:
+                floor = self.top - self.gap_window
+                self.gaps = {gap for gap in self.gaps if gap >= floor}
+        elif seq in self.gaps:
+            self.gaps.discard(seq)
+        else:
+            self.duplicates += 1
+            return
+        self.unique += 1
+
+    def __len__(self):
+        return self.unique
+
+
+class Stats:
+    """Counters shared by the writer and all clients"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.bytes_written = 0
+        self.responses_written = 0
+        self.responses_received = 0
+        self.responses_seen = SeqTracker()
+        self.response_latencies = []
+        self.relay_sent = 0
+        self.relay_expected = 0
+        self.relay_received = 0
+        self.relay_latencies = []
+        self.send_errors = 0
+        self.rss_samples = {}
+
+    def report(self, final=False):
+        elapsed = max(time.time() - self.started, 1e-9)
+        response_lat = sorted(self.response_latencies)
+        relay_lat = sorted(self.relay_latencies)
+        # Responses still in flight (the parser only emits a block once the next one starts)
+        responses_dropped = max(0, self.responses_written - len(self.responses_seen) - 1)
+        relay_dropped = max(0, self.relay_expected - self.relay_received)
+
+        print("=" * 60 if final else "-" * 60)
+        print(f"{'Final report' if final else 'Progress'} after {elapsed:.0f}s")
+        print(f"  Log throughput:   {self.bytes_written / elapsed / 1e6:.2f} MB/s "
+              f"({self.bytes_written / 1e6:.1f} MB, {self.responses_written} responses)")
+        print(f"  Parser responses: {len(self.responses_seen)} received "
+              f"({self.responses_seen.duplicates} duplicates), "
+              f"{responses_dropped} missing")
+        print(f"  Parser latency:   p50 {percentile(response_lat, 50) * 1000:.1f}ms  "
+              f"p95 {percentile(response_lat, 95) * 1000:.1f}ms  "
+              f"p99 {percentile(response_lat, 99) * 1000:.1f}ms")
+        print(f"  Relay messages:   {self.relay_sent} sent, {self.relay_received}/{self.relay_expected} "
+              f"delivered, {relay_dropped} dropped, {self.send_errors} send errors")
+        print(f"  Relay latency:    p50 {percentile(relay_lat, 50) * 1000:.1f}ms  "
+              f"p95 {percentile(relay_lat, 95) * 1000:.1f}ms  "
+              f"p99 {percentile(relay_lat, 99) * 1000:.1f}ms")
+        for name, samples in self.rss_samples.items():
+            if samples:
+                print(f"  {name} RSS:  start {samples[0] / 1e6:.1f}MB  "
+                      f"peak {max(samples) / 1e6:.1f}MB  now {samples[-1] / 1e6:.1f}MB  "
+                      f"growth {(samples[-1] - samples[0]) / 1e6:+.1f}MB")
+        print("=" * 60 if final else "-" * 60)
+
+        # Keep memory bounded on multi-hour runs: percentiles over a recent window are enough
+        if len(self.response_latencies) > 200000:
+            del self.response_latencies[:100000]
+        if len(self.relay_latencies) > 200000:
+            del self.relay_latencies[:100000]
+
+
+def synthetic_block(seq, rng):
+    """One Claude-style response block with terminal noise around it"""
+    sentence_count = rng.randint(1, 6)
+    body = []
+    for _ in range(sentence_count):
+        words = rng.sample(WORDS, rng.randint(5, 12))
+        body.append(" ".join(words).capitalize() + ".")
+
+    lines = [
+        f"\x1b[2K\x1b[1G\x1b[38;5;174m{rng.choice(SPINNERS)}\x1b[39m (esc to interrupt)",
+        f"\x1b[1m⏺\x1b[22m [load r={seq} t={time.time():.6f}] {body[0]}",
+    ]
+    lines += [f"  {sentence}" for sentence in body[1:]]
+
+    if rng.random() < 0.2:
+        # Option menu, the way Claude renders permission prompts
+        lines += [
+            "  Do you want to proceed?",
+            "\x1b[36m❯ 1. Yes\x1b[39m",
+            "  2. Yes, and don't ask again this session",
+            "  3. No, and tell Claude what to do differently (esc)",
+            "─" * 40,
+        ]
+    lines.append("\x1b[2m? for shortcuts\x1b[22m")
+    return "\r\n".join(lines) + "\r\n"
+
+
+async def write_log(path, rate_mb, deadline, stats, seed):
+    """Append synthetic TUI output to the session log at rate_mb MB/s"""
+    rng = random.Random(seed)
+    bytes_per_tick = rate_mb * 1e6 * TICK
+    seq = 0
+    with open(path, "a", encoding="utf-8") as f:
+        next_tick = time.monotonic()
+        while time.time() < deadline:
+            budget = bytes_per_tick
+            chunk = []
+            while budget > 0:
+                block = synthetic_block(seq, rng)
+                chunk.append(block)
+                budget -= len(block.encode("utf-8"))
+                seq += 1
+            data = "".join(chunk)
+            f.write(data)
+            f.flush()
+            stats.bytes_written += len(data.encode("utf-8"))
+            stats.responses_written = seq
+
+            next_tick += TICK
+            await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+
+
+async def phone_client(client_id, url, msg_rate, deadline, stats, client_count, seed):
+    """Fake phone: sends query/action traffic and measures relay delivery"""
+    rng = random.Random(seed + client_id)
+    # Delivery bookkeeping only counts other phones (the relay never echoes to the sender)
+    others = client_count - 1
+    try:
+        async with websockets.connect(url, max_size=None) as ws:
+            async def receive():
+                async for message in ws:
+                    try:
+                        data = json.loads(message)
+                    except json.JSONDecodeError:
+                        continue
+                    # Parser responses are broadcast to every phone; only the listener counts them
+                    handle_incoming(data, stats, count_responses=client_id < 0)
+
+            receiver = asyncio.create_task(receive())
+            seq = 0
+            interval = 1.0 / msg_rate if msg_rate > 0 else None
+            while time.time() < deadline:
+                if interval is None:
+                    await asyncio.sleep(TICK)
+                    continue
+                await asyncio.sleep(rng.expovariate(1.0 / interval))
+                kind = "action" if rng.random() < 0.3 else "query"
+                payload = {
+                    "type": kind,
+                    "content": rng.choice(["1", "two", "the second one"]) if kind == "action"
+                    else f"load test query {seq}",
+                    "load": {"client": client_id, "seq": seq, "t": time.time()},
+                }
+                try:
+                    await ws.send(json.dumps(payload))
+                    stats.relay_sent += 1
+                    stats.relay_expected += others
+                except websockets.exceptions.ConnectionClosed:
+                    stats.send_errors += 1
+                    break
+                seq += 1
+
+            # Let in-flight messages land before closing
+            await asyncio.sleep(1)
+            receiver.cancel()
+    except (OSError, websockets.exceptions.WebSocketException) as e:
+        print(f"❌ Client {client_id} failed: {e}")
+        stats.send_errors += 1
+
+
+def handle_incoming(data, stats, count_responses):
+    now = time.time()
+    if data.get("type") == "response":
+        if not count_responses:
+            return
+        content = data.get("content")
+        text = content.get("text", "") if isinstance(content, dict) else ""
+        match = RESPONSE_MARKER.search(text)
+        if match:
+            stats.responses_received += 1
+            stats.responses_seen.add(int(match.group(1)))
+            stats.response_latencies.append(now - float(match.group(2)))
+    elif isinstance(data.get("load"), dict):
+        stats.relay_received += 1
+        stats.relay_latencies.append(now - data["load"]["t"])
+
+
+relay_clients = set()
+
+
+async def relay_handler(websocket):
+    """Broadcast relay for --serve: forward each message to every other client"""
+    relay_clients.add(websocket)
+    try:
+        async for message in websocket:
+            others = relay_clients - {websocket}
+            if others:
+                websockets.broadcast(others, message)
+    except websockets.exceptions.ConnectionClosed:
+        pass
+    finally:
+        relay_clients.discard(websocket)
+
+
+def find_process(pattern):
+    if psutil is None:
+        return None
+    for p in psutil.process_iter(["pid", "cmdline"]):
+        cmdline = " ".join(p.info.get("cmdline") or [])
+        if pattern in cmdline and p.pid != os.getpid():
+            return p
+    return None
+
+
+def serve_relay(ready, port=8765):
+    """Child process for --serve: the broadcast relay on its own, so its RSS is the relay's"""
+    async def main():
+        async with websockets.serve(relay_handler, "localhost", port, max_size=None):
+            ready.set()
+            await asyncio.Future()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+async def monitor(deadline, stats, interval, processes):
+    while time.time() < deadline:
+        await asyncio.sleep(min(interval, max(0.0, deadline - time.time())))
+        for name, process in processes.items():
+            try:
+                stats.rss_samples.setdefault(name, []).append(process.memory_info().rss)
+            except Exception:
+                pass
+        if time.time() < deadline:
+            stats.report()
+
+
+async def run(args):
+    stats = Stats()
+    deadline = time.time() + args.duration
+
+    relay = None
+    if args.serve:
+        context = multiprocessing.get_context("spawn")
+        ready = context.Event()
+        relay = context.Process(target=serve_relay, args=(ready,), daemon=True)
+        relay.start()
+        if not await asyncio.to_thread(ready.wait, 10):
+            relay.terminate()
+            raise SystemExit("❌ Relay process did not start")
+        print(f"✓ Hosting broadcast relay on ws://localhost:8765 (pid {relay.pid})")
+
+    processes = {}
+    if psutil is not None:
+        parser_process = psutil.Process(args.parser_pid) if args.parser_pid else find_process("parser.py")
+        if parser_process:
+            processes["Parser"] = parser_process
+        if relay:
+            processes["Relay "] = psutil.Process(relay.pid)
+        else:
+            relay_process = find_process("websocketServer") or find_process("server.py")
+            if relay_process:
+                processes["Relay "] = relay_process
+    if not processes:
+        print("⚠ Parser/relay process not found (or psutil missing); memory growth not tracked")
+
+    print(f"Load: {args.rate} MB/s into {args.log}, {args.clients} clients × "
+          f"{args.msg_rate} msg/s via {args.url}, for {args.duration:.0f}s")
+
+    tasks = [
+        write_log(args.log, args.rate, deadline, stats, args.seed),
+        monitor(deadline, stats, args.report_interval, processes),
+    ]
+    # One passive listener receives parser responses even with --clients 0
+    tasks.append(phone_client(-1, args.url, 0, deadline, stats, 1, args.seed))
+    tasks += [
+        phone_client(i, args.url, args.msg_rate, deadline, stats, args.clients + 1, args.seed)
+        for i in range(args.clients)
+    ]
+
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        if relay:
+            relay.terminate()
+            relay.join()
+        stats.report(final=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test the parser and relay")
+    parser.add_argument("--url", default=WS_URL, help="relay WebSocket URL")
+    parser.add_argument("--log", default=LOG_FILE, help="session log the parser tails")
+    parser.add_argument("--rate", type=float, default=0.1, help="synthetic TUI output in MB/s")
+    parser.add_argument("--clients", type=int, default=5, help="number of fake phone clients")
+    parser.add_argument("--msg-rate", type=float, default=0.5, help="messages per second per client")
+    parser.add_argument("--duration", type=parse_duration, default=60.0, help="e.g. 90s, 15m, 3h")
+    parser.add_argument("--report-interval", type=parse_duration, default=30.0)
+    parser.add_argument("--parser-pid", type=int, help="parser PID for memory tracking")
+    parser.add_argument("--serve", action="store_true",
+                        help="host a minimal broadcast relay (not examples/server.py) in a child process")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
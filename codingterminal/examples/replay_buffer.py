@@ -0,0 +1,74 @@
+"""
+Bounded per-session replay buffer for the example relays.
+
+The relay remembers, per parser session, the last K responses and the prompt
+Claude is currently waiting on (the latest response with options, until
+someone answers it). New subscribers get it as one compact snapshot, so a
+phone that reconnects knows what Claude asked without re-querying Claude.
+
+    {"type": "snapshot", "content": {"sessions": {"<session>": {
+        "pending": {"text": "...", "options": [...]} | null,
+        "recent": [{"text": "...", "options": [...], "history_id": 12}, ...]
+    }}}}
+"""
+
+from collections import OrderedDict, deque
+
+DEFAULT_SESSION = "default"
+
+
+class ReplayBuffer:
+    def __init__(self, max_responses=10, max_sessions=16):
+        self.max_responses = max_responses
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+
+    def _session(self, name):
+        session = self._sessions.get(name)
+        if session is None:
+            session = {"pending": None, "recent": deque(maxlen=self.max_responses)}
+            self._sessions[name] = session
+            # Forget the least recently active session
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(name)
+        return session
+
+    def record(self, message):
+        """Update the buffer from a relayed message (dict). Unknown types are ignored."""
+        if not isinstance(message, dict):
+            return
+        kind = message.get("type")
+        name = message.get("session") or DEFAULT_SESSION
+
+        if kind == "response":
+            content = message.get("content")
+            if not isinstance(content, dict):
+                return
+            entry = {"text": content.get("text", ""), "options": content.get("options") or []}
+            if content.get("spoken") is not None:
+                entry["spoken"] = content["spoken"]
+            if "history_id" in message:
+                entry["history_id"] = message["history_id"]
+            session = self._session(name)
+            session["recent"].append(entry)
+            # A menu stays pending until answered; a newer plain response means Claude moved on
+            session["pending"] = entry if entry["options"] else None
+
+        elif kind in ("action", "confirmation", "cancel"):
+            # The pending prompt was answered (or abandoned); phones don't know
+            # the parser's session, so clear it everywhere
+            for session in self._sessions.values():
+                session["pending"] = None
+
+    def snapshot(self):
+        """Compact state for a new subscriber, or None if there is nothing to send"""
+        sessions = {
+            name: {"pending": session["pending"], "recent": list(session["recent"])}
+            for name, session in self._sessions.items()
+            if session["recent"] or session["pending"]
+        }
+        if not sessions:
+            return None
+        return {"type": "snapshot", "content": {"sessions": sessions}}
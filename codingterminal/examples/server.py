@@ -2,34 +2,62 @@ import asyncio
 import json
 import websockets
 
+from replay_buffer import ReplayBuffer
+from subscriptions import Subscriptions
+
 # Store all connected clients
 connected_clients = set()
 
+# Last responses and pending prompt, sent to clients when they connect
+replay = ReplayBuffer()
+
+# Segment types each client asked for (filtered here, per client)
+subscriptions = Subscriptions()
+
 async def handler(websocket):
     # Add new client
     connected_clients.add(websocket)
     print(f"Client connected (total: {len(connected_clients)})")
 
     try:
+        snapshot = replay.snapshot()
+        if snapshot:
+            await websocket.send(json.dumps(snapshot))
+
         async for message in websocket:
             print("Received from client:", message)
+            try:
+                payload = json.loads(message)
+            except json.JSONDecodeError:
+                payload = None
+            reply = subscriptions.handle(websocket, payload)
+            if reply:
+                await websocket.send(json.dumps(reply))
+                continue
+            replay.record(payload)
             # Broadcast to all OTHER clients (not the sender)
             other_clients = connected_clients - {websocket}
             if other_clients:
                 await asyncio.gather(
-                    *(client.send(message) for client in other_clients),
+                    *(client.send(subscriptions.payload_for(client, payload, message))
+                      for client in other_clients),
                     return_exceptions=True
                 )
     except websockets.exceptions.ConnectionClosed:
         pass
     finally:
         connected_clients.remove(websocket)
+        subscriptions.drop(websocket)
         print(f"Client disconnected (total: {len(connected_clients)})")
 
 async def broadcast_new_data(new_data):
+    replay.record({"type": "response", "content": new_data})
     if connected_clients:  # Only broadcast if there are clients
-        payload = json.dumps({"type": "response", "content": [new_data]})
-        await asyncio.gather(*(client.send(payload) for client in connected_clients))
+        message = {"type": "response", "content": [new_data]}
+        payload = json.dumps(message)
+        # Each client gets the response filtered by its own subscription
+        await asyncio.gather(*(client.send(subscriptions.payload_for(client, message, payload))
+                               for client in connected_clients))
 
 import asyncio
 import json
@@ -38,9 +66,14 @@ import psutil
 import time
 import os
 
+from replay_buffer import ReplayBuffer
+
 # Store all connected clients
 connected_clients = set()
 
+# Last responses and pending prompt, sent to clients when they connect
+replay = ReplayBuffer()
+
 
 def find_claude_tty(process_name="claude"):
     """Try to find the TTY device path for a running 'claude' process.
@@ -89,6 +122,10 @@ async def handler(websocket, path):
     print("Client connected")
 
     try:
+        snapshot = replay.snapshot()
+        if snapshot:
+            await websocket.send(json.dumps(snapshot))
+
         async for message in websocket:
             print("Received from client:", message)
             # Try to parse JSON and handle typing commands
@@ -96,6 +133,7 @@ async def handler(websocket, path):
                 payload = json.loads(message)
             except Exception:
                 payload = None
+            replay.record(payload)
 
             if isinstance(payload, dict):
                 # Accept different keys that might carry user queries
@@ -122,6 +160,7 @@ async def handler(websocket, path):
 
 
 async def broadcast_new_data(new_data):
+    replay.record({"type": "response", "content": new_data})
     if connected_clients:  # Only broadcast if there are clients
         payload = json.dumps({"type": "response", "content": [new_data]})
         await asyncio.gather(*(client.send(payload) for client in connected_clients))
@@ -0,0 +1,73 @@
+"""
+Per-client segment subscriptions for the example relays.
+
+The parser sends every response whole; a client that only speaks or renders
+some segment types asks the relay for just those:
+
+    {"type": "subscribe", "segments": ["prose", "options"]}
+
+The relay answers that client alone with
+{"type": "subscribed", "content": {"segments": [...]}} and from then on
+filters each response it forwards to it. The filter belongs to the client's
+connection, so a phone subscribing to prose never changes what a dashboard
+on the same relay receives.
+
+`segments` repeats the content of `text`, so clients that never subscribed
+get responses without it (the same size as before segments existed).
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aura_parser.segments import SEGMENT_TYPES, filter_capture
+
+
+class Subscriptions:
+    def __init__(self):
+        self._filters = {}
+        # Encoded variants of the message being broadcast, one per distinct filter
+        self._message = None
+        self._encoded = {}
+
+    def handle(self, client, message):
+        """Reply for a subscribe message (to send back to client only), or None for anything else"""
+        if not isinstance(message, dict) or message.get("type") != "subscribe":
+            return None
+        requested = message.get("segments") or []
+        unknown = [t for t in requested if t not in SEGMENT_TYPES]
+        if unknown:
+            content = {"error": f"Unknown segment types: {unknown}", "available": list(SEGMENT_TYPES)}
+        else:
+            if requested:
+                self._filters[client] = set(requested)
+            else:
+                self._filters.pop(client, None)
+            content = {"segments": sorted(requested)}
+        return {"type": "subscribed", "content": content}
+
+    def payload_for(self, client, message, raw):
+        """What to send client for a relayed message: raw, or the response filtered for it"""
+        if not isinstance(message, dict) or message.get("type") != "response":
+            return raw
+        content = message.get("content")
+        if not isinstance(content, dict) or "segments" not in content:
+            return raw
+
+        if message is not self._message:
+            self._message = message
+            self._encoded = {}
+        types = frozenset(self._filters.get(client, ()))
+        payload = self._encoded.get(types)
+        if payload is None:
+            if types:
+                content = filter_capture(content, types)
+            else:
+                content = {k: v for k, v in content.items() if k != "segments"}
+            payload = self._encoded[types] = json.dumps(dict(message, content=content), ensure_ascii=False)
+        return payload
+
+    def drop(self, client):
+        self._filters.pop(client, None)
@@ -11,6 +11,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from parser import parse_number
+from aura_parser.option_resolver import MIN_CONFIDENCE, resolve_option
 
 def test_parse_number():
     """Test the parse_number function with various inputs"""
@@ -60,6 +61,56 @@ def test_parse_number():
 
     return failed == 0
 
+def test_permission_menu():
+    """Spoken answers to Claude's permission menu (including refusals) and a plain menu"""
+    print("\n" + "=" * 60)
+    print("Testing resolve_option on the permission and language menus")
+    print("=" * 60)
+
+    permission = ["Yes", "Yes, and don't ask again this session", "No, and tell Claude what to do differently (esc)"]
+    languages = ["Python", "JavaScript", "Rust", "Go"]
+    test_cases = [
+        # (answer, option acted on or None for a retry, description)
+        ("yes", 1, "Plain yes"),
+        ("yes and don't ask again", 2, "Yes, don't ask again"),
+        ("don't ask again", 2, "Quoting option 2"),
+        ("the second one", 2, "Ordinal"),
+        ("no", 3, "Plain no"),
+        ("don't do that", 3, "Refusal is not a yes"),
+        ("never", 3, "Single negation"),
+        ("stop", 3, "Stop"),
+        ("please do not run it", 3, "Negated request"),
+        ("not the first one", None, "Negated ordinal retries"),
+        ("sure, why not", 1, "Agreeing idiom after yes word"),
+        ("yes, I don't mind", 1, "Yes with a negation inside"),
+        ("why not", 1, "Agreeing idiom alone"),
+        ("no problem", 1, "No-word idiom agrees"),
+    ]
+    test_cases = [(answer, permission, expected, description) for answer, expected, description in test_cases]
+    test_cases += [
+        ("python three", languages, None, "Number and keyword disagree"),
+        ("rust, the third one", languages, 3, "Number and keyword agree"),
+        ("three", languages, 3, "Spelled number"),
+    ]
+
+    passed = 0
+    failed = 0
+    for answer, options, expected, description in test_cases:
+        match = resolve_option(answer, options)
+        result = match.number if match and match.confidence >= MIN_CONFIDENCE else None
+        ok = result == expected
+        passed += ok
+        failed += not ok
+        detail = f"{match.reason} {match.confidence:.2f}" if match else "no match"
+        print(f"{'✓' if ok else '✗'} {description:30} | '{answer}' → {result} (expected {expected}, {detail})"
+              f"{'' if ok else ' ⚠️ FAILED'}")
+
+    print("=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return failed == 0
+
 def simulate_action_handling():
     """Simulate the action handling logic"""
     print("\n" + "=" * 60)
@@ -79,7 +130,7 @@ def simulate_action_handling():
     for i, opt in enumerate(last_response['data']['options'], 1):
         print(f"      {i}. {opt}")
 
-    test_actions = ["1", "three", "banana", "10"]
+    test_actions = ["1", "three", "the second one", "rust please", "banana", "10"]
 
     for action_input in test_actions:
         print(f"\n{'─' * 60}")
@@ -87,6 +138,12 @@ def simulate_action_handling():
 
         action_num = parse_number(action_input)
 
+        if action_num is None:
+            match = resolve_option(action_input, last_response['data']['options'])
+            if match and match.confidence >= MIN_CONFIDENCE:
+                print(f"🎯 Resolved to option {match.number} ({match.reason}, confidence {match.confidence:.2f})")
+                action_num = match.number
+
         if action_num is not None:
             print(f"✓ Parsed as number: {action_num}")
             down_presses = action_num - 1
@@ -109,6 +166,7 @@ def simulate_action_handling():
 if __name__ == "__main__":
     # Test parse_number function
     success = test_parse_number()
+    success = test_permission_menu() and success
 
     # Simulate action handling
     simulate_action_handling()
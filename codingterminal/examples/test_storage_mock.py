@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Mock test for what the parser keeps between responses: the dedupe window
+(TTL expiry and LRU eviction, with a fake clock) and history pagination
+(a throwaway SQLite file). No tmux, Claude or WebSocket server needed.
+"""
+
+import os
+import sys
+import tempfile
+
+# Add parent directory to path so we can import aura_parser
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aura_parser.dedupe import ResponseDeduper
+from aura_parser.history import HistoryStore
+
+
+def check(description, ok, detail=""):
+    print(f"{'✓' if ok else '✗'} {description:45} {detail}{'' if ok else ' ⚠️ FAILED'}")
+    return ok
+
+
+def capture(text, options=()):
+    return {"text": text, "options": list(options)}
+
+
+def test_dedupe_ttl():
+    print("\n" + "=" * 60)
+    print("Testing ResponseDeduper TTL")
+    print("=" * 60)
+    now = [0.0]
+    deduper = ResponseDeduper(window=256, ttl=10, clock=lambda: now[0])
+    menu = capture("Do you want to proceed?", ["Yes", "No"])
+
+    ok = check("First sighting is kept", not deduper.is_duplicate(menu))
+    now[0] = 2
+    ok = check("Redraw 2s later is dropped", deduper.is_duplicate(capture("do you  want to proceed?", ["Yes", "No"]))) and ok
+    now[0] = 11
+    # The redraw at 2s refreshed the entry, so 11s is still within 10s of it
+    ok = check("Redraw chain keeps collapsing", deduper.is_duplicate(menu)) and ok
+    now[0] = 60
+    ok = check("Same prompt a minute later is kept", not deduper.is_duplicate(menu)) and ok
+    ok = check("  expired counted", deduper.expired == 1, f"expired={deduper.expired}") and ok
+
+    no_ttl = ResponseDeduper(window=256, ttl=None, clock=lambda: now[0])
+    no_ttl.is_duplicate(menu)
+    now[0] = 10000
+    ok = check("ttl=None never expires", no_ttl.is_duplicate(menu)) and ok
+    return ok
+
+
+def test_dedupe_eviction():
+    print("\n" + "=" * 60)
+    print("Testing ResponseDeduper window eviction")
+    print("=" * 60)
+    deduper = ResponseDeduper(window=2, ttl=None)
+    a, b, c = capture("alpha"), capture("beta"), capture("gamma")
+
+    deduper.is_duplicate(a)
+    deduper.is_duplicate(b)
+    ok = check("Seen response inside window is dropped", deduper.is_duplicate(a))
+    # a was just refreshed, so c evicts b
+    deduper.is_duplicate(c)
+    ok = check("Least recently seen is evicted", not deduper.is_duplicate(b), f"evicted={deduper.evicted}") and ok
+    ok = check("Window stays bounded", deduper.stats()["tracked"] == 2, f"tracked={deduper.stats()['tracked']}") and ok
+    disabled = ResponseDeduper(window=0)
+    disabled.is_duplicate(a)
+    ok = check("window=0 disables dedupe", not disabled.is_duplicate(a)) and ok
+    return ok
+
+
+def test_history_pagination():
+    print("\n" + "=" * 60)
+    print("Testing HistoryStore pagination")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(os.path.join(tmp, "history.db"), session="mock").open()
+        ids = [store.add(capture(f"response {i} about the parser"), ts=1000 + i) for i in range(25)]
+
+        page = store.query(limit=10)
+        ok = check("Newest page first", [item["id"] for item in page["items"]] == ids[:-11:-1],
+                   f"{page['items'][0]['id']}..{page['items'][-1]['id']}")
+        ok = check("  has_more and next_before", page["has_more"] and page["next_before"] == ids[15]) and ok
+
+        seen = [item["id"] for item in page["items"]]
+        while page["has_more"]:
+            page = store.query(limit=10, before=page["next_before"])
+            seen += [item["id"] for item in page["items"]]
+        ok = check("Paging back visits every row once", seen == ids[::-1], f"{len(seen)} rows") and ok
+
+        page = store.query(limit=10, after=ids[19])
+        ok = check("Paging forward is oldest first", [item["id"] for item in page["items"]] == ids[20:],
+                   f"{len(page['items'])} rows") and ok
+        ok = check("  last page has no more", not page["has_more"] and page["next_after"] == ids[-1]) and ok
+
+        page = store.query(since=1010, until=1012)
+        ok = check("Time range filter", [item["seq"] for item in page["items"]] == [13, 12, 11]) and ok
+
+        page = store.query(search="response 7 abo")
+        ok = check("Search with prefix match", [item["id"] for item in page["items"]] == [ids[7]],
+                   f"fts={store.fts}") and ok
+
+        page = store.query(limit=1000)
+        ok = check("Limit is capped", len(page["items"]) == 25 and not page["has_more"]) and ok
+        store.close()
+    return ok
+
+
+if __name__ == "__main__":
+    results = [test_dedupe_ttl(), test_dedupe_eviction(), test_history_pagination()]
+    print("\n" + "=" * 60)
+    print(f"Results: {sum(results)} passed, {len(results) - sum(results)} failed")
+    print("=" * 60)
+    sys.exit(0 if all(results) else 1)
@@ -74,12 +74,16 @@ async def interactive_input():
 
             if query.strip():
                 if clients:
-                    message = json.dumps({
-                        "type": "query",
-                        "query": query
-                    })
-
-                    print(f"📤 Sending to Claude: {query[:60]}...")
+                    if query.strip() == "/cancel":
+                        # Ctrl-C, handled ahead of any queued queries
+                        message = json.dumps({"type": "cancel"})
+                        print(f"📤 Sending cancel to Claude")
+                    else:
+                        message = json.dumps({
+                            "type": "query",
+                            "query": query
+                        })
+                        print(f"📤 Sending to Claude: {query[:60]}...")
                     await asyncio.gather(
                         *[client.send(message) for client in clients],
                         return_exceptions=True
@@ -98,6 +102,7 @@ async def main():
     print("\nMode: Listening for connections")
     print("  - Receives Claude responses automatically")
     print("  - Type queries and press Enter to send them to Claude")
+    print("  - Type /cancel to interrupt Claude (Ctrl-C)")
     print("  - Use test_query.py to send queries programmatically")
     print("  - Press Ctrl+C to stop\n")
 